@@ -1,14 +1,778 @@
 # pages/11Cost_Calculation.py
 import streamlit as st
 import pandas as pd
+import numpy as np
+import itertools
 import json
+import logging
+import orjson
+import traceback
 
 from utils.calculations import LogisticsCostCalculator
 from utils.data_manager import DataManager
-from utils.excel_exporter import LogisticsExcelExporter
 
 st.set_page_config(page_title="Cost Calculation", page_icon="💰", layout="wide")
 
+logger = logging.getLogger(__name__)
+
+# Status emoji indexed by bool(count) - avoids a ternary per metric.
+_STATUS = ('❌', '✅')
+
+
+@st.cache_data(show_spinner=False)
+def _sum_cost_values(cost_values: tuple) -> float:
+    """Memoized sum of additional-cost values, keyed on the hashable value tuple."""
+    return float(sum(cost_values))
+
+
+def _df_to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame to CSV bytes with pyarrow's columnar writer.
+
+    Much faster than pandas' general-purpose to_csv on numeric-heavy
+    result tables.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    buf = pa.BufferOutputStream()
+    pacsv.write_csv(table, buf)
+    return buf.getvalue().to_pybytes()
+
+
+# --- Cached option-label builders -------------------------------------------
+# Each Precise-Mode selectbox rebuilt its label list with f-strings on every
+# rerun. The underlying config lists rarely change, so the label lists are
+# cached on the config data itself.
+
+@st.cache_data(show_spinner=False)
+def _location_labels(suppliers):
+    return [
+        f"{s.get('vendor_country','?')} - {s.get('city_of_manufacture','?')} - {s.get('plant','?')} - {s.get('country','?')}"
+        + (f" ({s.get('distance')} km)" if s.get('distance') is not None else "")
+        for s in suppliers
+    ]
+
+
+@st.cache_data(show_spinner=False)
+def _operations_labels(operations):
+    return [
+        f"{op.get('incoterm_code','?')} @ {op.get('incoterm_place','?')} | {op.get('currency','?')} | {op.get('lead_time','?')}d lead time"
+        for op in operations
+    ]
+
+
+@st.cache_data(show_spinner=False)
+def _packaging_labels(packaging_configs):
+    return [
+        f"{pkg.get('box_type','?')} | {pkg.get('pallet_type','?')} | SP: {pkg.get('sp_needed','?')}"
+        for pkg in packaging_configs
+    ]
+
+
+@st.cache_data(show_spinner=False)
+def _repacking_labels(repacking_configs):
+    return [
+        f"{rep.get('pcs_weight','?')} | {rep.get('packaging_one_way','?')}"
+        for rep in repacking_configs
+    ]
+
+
+@st.cache_data(show_spinner=False)
+def _transport_labels(transport_configs):
+    return [
+        f"{trans.get('mode1','?')} | Auto-calculated | SF: {trans.get('stack_factor','?')}"
+        if trans.get('auto_calculate', False)
+        else f"{trans.get('mode1','?')} | €{trans.get('cost_lu',0):.2f}/LU | SF: {trans.get('stack_factor','?')}"
+        for trans in transport_configs
+    ]
+
+
+@st.cache_data(show_spinner=False)
+def _co2_labels(co2_configs):
+    return [
+        f"€{co2.get('cost_per_ton',0):.0f}/ton | Factor: {co2.get('co2_conversion_factor','?')}"
+        for co2 in co2_configs
+    ]
+
+
+@st.cache_data(show_spinner=False)
+def _warehouse_labels(warehouse_configs):
+    return [
+        f"€{wh.get('cost_per_loc',0):.2f}/location/month"
+        for wh in warehouse_configs
+    ]
+
+
+@st.cache_data(show_spinner=False)
+def _interest_labels(interest_configs):
+    return [f"{intr.get('rate',0):.2f}% annual" for intr in interest_configs]
+
+
+def _load_all_configs(version: int, data_manager) -> dict:
+    """All configuration lists in one dict, memoized per session.
+
+    The lists and the version counter both live in st.session_state, so
+    the memo does too — a process-global st.cache_data entry keyed on the
+    per-session counter could serve one session's configurations to
+    another that happens to share the same version number.
+    """
+    cached = st.session_state.get('_configs_cache')
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    configs = {
+        'materials': data_manager.get_materials(),
+        'suppliers': data_manager.get_suppliers(),
+        'operations': data_manager.get_operations(),
+        'packaging': data_manager.get_packaging(),
+        'repacking': data_manager.get_repacking(),
+        'transport': data_manager.get_transport(),
+        'co2': data_manager.get_co2(),
+        'warehouse': data_manager.get_warehouse(),
+        'interest': data_manager.get_interest(),
+        'additional_costs': data_manager.get_additional_costs(),
+    }
+    st.session_state['_configs_cache'] = (version, configs)
+    return configs
+
+
+@st.cache_data(show_spinner=False)
+def _cached_pairs(materials, suppliers, _data_manager):
+    """Material-supplier pair product, cached on the underlying config lists.
+
+    The product is O(materials x suppliers); caching on the lists themselves
+    means it is rebuilt only when a material or supplier actually changes.
+    """
+    return _data_manager.get_material_supplier_pairs()
+
+
+@st.cache_data(persist="disk", max_entries=50, show_spinner=False)
+def _compute_results(pairs_key: str, configs_key: str, _pairs, _configs, _calculator) -> list:
+    """Calculate logistics costs for the selected pairs and configurations.
+
+    Persisted to disk so re-running with identical selections (including after
+    a page reload or app restart) returns the stored results instead of
+    invoking the calculator again. ``pairs_key`` and ``configs_key`` are
+    content-based serializations of the pair and configuration payloads, so
+    editing a material or supplier invalidates the entry; the
+    underscore-prefixed arguments carry the actual payload and are excluded
+    from hashing.
+    """
+    return _calculator.calculate_batch(
+        _pairs,
+        packaging_config=_configs['packaging'],
+        transport_config=_configs['transport'],
+        warehouse_config=_configs['warehouse'],
+        repacking_config=_configs['repacking'],
+        duty_rate_percent=_configs.get('duty_rate_percent', 0),
+        co2_config=_configs['co2'],
+        additional_costs=_configs['additional_costs'],
+        operations_config=_configs['operations'],
+        inventory_config=_configs['interest'],
+    )
+
+
+@st.cache_data(show_spinner=False)
+def _results_df(results_sig: tuple, _results) -> pd.DataFrame:
+    """Full columnar view of the results list, built once per calculation.
+
+    The list of dicts is fine for row-oriented rendering, but scans and
+    exports are cheaper over contiguous columns; this frame backs both.
+    """
+    return pd.DataFrame(_results)
+
+
+@st.cache_data(show_spinner=False)
+def _comparison_df(best_key: tuple, worst_key: tuple, _best, _worst) -> pd.DataFrame:
+    """Component comparison frame for the best/worst pair, cached on
+    their identities so toggling display widgets skips the rebuild."""
+    best_vec = np.fromiter((_best.get(c, 0) for c in _COMPARISON_COMPONENTS), dtype=np.float64)
+    worst_vec = np.fromiter((_worst.get(c, 0) for c in _COMPARISON_COMPONENTS), dtype=np.float64)
+    return pd.DataFrame({
+        'Component': list(_COMPARISON_COMPONENT_NAMES),
+        'Best Config': best_vec,
+        'Worst Config': worst_vec,
+        'Difference': worst_vec - best_vec,
+    })
+
+
+@st.cache_data(show_spinner=False)
+def _result_labels(results_sig: tuple, _results):
+    """Selectbox labels for the export result picker, cached like the
+    config option lists."""
+    return [
+        f"{r.get('material_id', '')} - {r.get('material_desc', '')} | "
+        f"{r.get('supplier_id', '')} - {r.get('supplier_name', '')}"
+        for r in _results
+    ]
+
+
+def _two_col_markdown(left_md: str, right_md: str):
+    """Render two prebuilt markdown payloads side by side.
+
+    One columns call and two container writes per tab instead of nested
+    with-blocks creating layout churn per column.
+    """
+    c1, c2 = st.columns(2)
+    c1.markdown(left_md)
+    c2.markdown(right_md)
+
+
+@st.cache_resource
+def _get_calculator() -> LogisticsCostCalculator:
+    """One calculator instance shared across reruns and sessions.
+
+    The calculator is stateless apart from its error list, which callers
+    reset per run via clear_errors().
+    """
+    return LogisticsCostCalculator()
+
+
+# Raw result key -> summary display column, in display order.
+_SUMMARY_MAP = {
+    'material_id': 'Material ID',
+    'material_desc': 'Material Description',
+    'supplier_id': 'Supplier ID',
+    'supplier_name': 'Supplier Name',
+    'total_cost_per_piece': 'Total Cost/Piece',
+    'packaging_cost_per_piece': 'Packaging Cost',
+    'transport_cost_per_piece': 'Transport Cost',
+    'warehouse_cost_per_piece': 'Warehouse Cost',
+    'co2_cost_per_piece': 'CO₂ Cost',
+    'total_annual_cost': 'Logistics cost supplier (year)',
+}
+
+
+# Cost components shown in the per-result distribution, as parallel
+# name/key tuples so the hot loop indexes constants instead of
+# rebuilding a dict per row.
+_COMP_NAMES = ('Packaging', 'Transport', 'Warehouse', 'CO₂', 'Customs', 'Repacking', 'Additional')
+_COMP_KEYS = (
+    'packaging_cost_per_piece',
+    'transport_cost_per_piece',
+    'warehouse_cost_per_piece',
+    'co2_cost_per_piece',
+    'customs_cost_per_piece',
+    'repacking_cost_per_piece',
+    'additional_cost_per_piece',
+)
+
+# Bound format method: the format string is parsed once at import
+# instead of per f-string evaluation in the breakdown loop.
+_EUR_LINE = "- {name}: €{v:.3f}".format
+
+# Cost components in breakdown display order.
+_BREAKDOWN_PAIRS = (
+    ('Packaging', 'packaging_cost_per_piece'),
+    ('Repacking', 'repacking_cost_per_piece'),
+    ('Transport', 'transport_cost_per_piece'),
+    ('Warehouse', 'warehouse_cost_per_piece'),
+    ('Customs', 'customs_cost_per_piece'),
+    ('CO₂', 'co2_cost_per_piece'),
+    ('Additional', 'additional_cost_per_piece'),
+)
+
+# Per-row defaults for the detailed breakdown: merged over each result
+# once so the render body uses plain subscripts instead of ~25 .get
+# probes per row.
+_ROW_DEFAULTS = {
+    **dict.fromkeys(_COMP_KEYS, 0),
+    **dict.fromkeys(
+        (
+            'total_cost_per_piece', 'total_annual_cost', 'Annual Volume',
+            'Price (Pcs)', 'Deliveries per Month', 'Transport cost per LU',
+            'Lead time (d)', 'safety_stock_no_pal', 'Duty Rate (% Of pcs price)',
+            'Filling degree per box', 'Filling degree per pallet', 'Packaging Loop',
+            'goods_receipt', 'stock_raw_materials', 'production',
+            'empties_return', 'cleaning', 'dispatch',
+        ),
+        0,
+    ),
+    **dict.fromkeys(
+        (
+            'Project Name', 'material_id', 'material_desc', 'supplier_id',
+            'supplier_name', 'City of Manufacture', 'Vendor ZIP',
+            'Transport type', 'Incoterm code', 'Incoterm Named Place',
+            'Call-off transfer type', 'Sub-Supplier Used',
+            'packaging_type', 'Special packaging required', 'SOP',
+        ),
+        'N/A',
+    ),
+}
+
+# Components contrasted in the best-vs-worst comparison table, with the
+# pretty names derived once at import instead of per rebuild.
+_COMPARISON_COMPONENTS = (
+    'packaging_cost_per_piece',
+    'transport_cost_per_piece',
+    'warehouse_cost_per_piece',
+    'co2_cost_per_piece',
+    'customs_cost_per_piece',
+    'repacking_cost_per_piece',
+)
+_COMPARISON_COMPONENT_NAMES = tuple(
+    c.replace('_cost_per_piece', '').replace('_', ' ').title()
+    for c in _COMPARISON_COMPONENTS
+)
+
+# Packaging-loop stages shown in the breakdown, in display order.
+_LOOP_STAGES = (
+    ('Goods Receipt', 'goods_receipt'),
+    ('Stock Raw Materials', 'stock_raw_materials'),
+    ('Production', 'production'),
+    ('Empties Return', 'empties_return'),
+    ('Cleaning', 'cleaning'),
+    ('Dispatch', 'dispatch'),
+)
+
+
+# Display-layer formatting for the summary table: values stay numeric in
+# the frame and the browser renders the currency strings.
+_SUMMARY_COLUMN_CONFIG = {
+    'Total Cost/Piece': st.column_config.NumberColumn(format="€%.3f"),
+    'Packaging Cost': st.column_config.NumberColumn(format="€%.3f"),
+    'Transport Cost': st.column_config.NumberColumn(format="€%.3f"),
+    'Warehouse Cost': st.column_config.NumberColumn(format="€%.3f"),
+    'CO₂ Cost': st.column_config.NumberColumn(format="€%.3f"),
+    'Logistics cost supplier (pcs)': st.column_config.NumberColumn(format="€%.3f"),
+    'Logistics cost supplier (year)': st.column_config.NumberColumn(format="localized"),
+}
+
+
+@st.cache_data(show_spinner=False)
+def _summary_df(results_sig: tuple, _results) -> pd.DataFrame:
+    """Summary table derived from the results, cached on the compute key.
+
+    One DataFrame constructor over the result dicts plus a reindex/rename,
+    instead of a comprehension per column; dtype inference stays with
+    pandas. The frame is what Streamlit serializes to the browser (as
+    Arrow), so ``results_sig`` keys the cache and ``_results`` carries the
+    payload.
+    """
+    df = pd.DataFrame(_results).reindex(columns=list(_SUMMARY_MAP)).rename(columns=_SUMMARY_MAP)
+    df.insert(len(df.columns) - 1, 'Logistics cost supplier (pcs)', df['Total Cost/Piece'])
+    return df
+
+
+@st.cache_data(show_spinner=False)
+def _summary_metrics(results_sig: tuple, _df):
+    """Headline metrics over the results, cached on the compute key.
+
+    Fused onto the shared columnar frame: the cost column is already
+    contiguous, so the three reductions run over one array with NaN rows
+    handled in the kernels instead of a Python prefilter.
+    """
+    costs = _df['total_cost_per_piece'].to_numpy(dtype=np.float64, na_value=np.nan)
+    if np.isnan(costs).all():
+        return len(_df), None, None, None
+    return (
+        len(_df),
+        float(np.nanmean(costs)),
+        float(np.nanmin(costs)),
+        float(np.nanmax(costs)),
+    )
+
+
+@st.fragment
+def _render_config_summary(selected_configs, n_pairs):
+    """Render the selected-configuration summary columns.
+
+    Fragment-scoped for the same reason as the results block: widget
+    interactions inside it should not recompute the whole page.
+    """
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.write(f"**Material-Supplier Pairs:** {n_pairs}")
+        location_name = (
+            selected_configs.get('location', {}).get('plant', 'Not selected')
+            if selected_configs.get('location')
+            else 'Not selected'
+        )
+        st.write(f"**Location:** {location_name}")
+        operations_name = (
+            selected_configs.get('operations', {}).get('incoterm_code', 'Not selected')
+            if selected_configs.get('operations')
+            else 'Not selected'
+        )
+        st.write(f"**Operations:** {operations_name}")
+        packaging_name = (
+            selected_configs.get('packaging', {}).get('box_type', 'Not selected')
+            if selected_configs.get('packaging')
+            else 'Not selected'
+        )
+        st.write(f"**Packaging:** {packaging_name}")
+
+    with col2:
+        transport_name = (
+            selected_configs.get('transport', {}).get('mode1', 'Not selected')
+            if selected_configs.get('transport')
+            else 'Not selected'
+        )
+        st.write(f"**Transport:** {transport_name}")
+        co2_cost = (
+            selected_configs.get('co2', {}).get('cost_per_ton', 0)
+            if selected_configs.get('co2')
+            else 0
+        )
+        st.write(f"**CO₂:** €{co2_cost}/ton")
+        warehouse_cost = (
+            selected_configs.get('warehouse', {}).get('cost_per_loc', 0)
+            if selected_configs.get('warehouse')
+            else 0
+        )
+        st.write(f"**Warehouse:** €{warehouse_cost}/loc")
+        duty_rate = selected_configs.get('duty_rate_percent', 0)
+        st.write(f"**Duty Rate:** {duty_rate}%")
+
+    with col3:
+        repacking_name = (
+            selected_configs.get('repacking', {}).get('pcs_weight', 'Not selected')
+            if selected_configs.get('repacking')
+            else 'Not selected'
+        )
+        st.write(f"**Repacking:** {repacking_name}")
+        interest_rate = (
+            selected_configs.get('interest', {}).get('rate', 0)
+            if selected_configs.get('interest')
+            else 0
+        )
+        st.write(f"**Interest:** {interest_rate}%")
+        additional_total = _sum_cost_values(
+            tuple(c.get('cost_value', 0) for c in selected_configs.get('additional_costs', []))
+        )
+        st.write(f"**Additional Costs:** €{additional_total:.2f}")
+
+
+@st.fragment
+def _render_results():
+    """Render export settings, result tables, exports and comparison analysis.
+
+    Wrapped in a fragment so interacting with the export/display widgets
+    reruns only this block instead of the whole configuration page.
+    """
+    if not st.session_state.get('calculation_results'):
+        st.info("No calculation results available. Please run the calculation first.")
+        return
+
+    results = st.session_state.calculation_results
+    # Same key _compute_results was stored under: exact, no collisions.
+    # The length fallback only covers results persisted by older sessions.
+    results_sig = st.session_state.get('calculation_sig') or (len(results),)
+    df_results = _results_df(results_sig, results)
+    # NaN-sentinel cost vector shared by every section: validity is
+    # decided by one isnan kernel instead of a .get probe per row.
+    tcp_all = df_results['total_cost_per_piece'].to_numpy(dtype=np.float64, na_value=np.nan)
+    valid_mask = ~np.isnan(tcp_all)
+    valid_results = [r for r, ok in zip(results, valid_mask) if ok]
+
+    st.markdown("---")
+    st.subheader("📁 Export Settings")
+    export_format = st.selectbox("Export Format", options=["Formatted Excel", "CSV", "JSON"])
+    show_detailed_breakdown = st.checkbox("Show Detailed Breakdown", value=True)
+
+    st.markdown("---")
+    st.subheader("📈 Calculation Results")
+
+    # Summary metrics
+    total_configurations, avg_total_cost, min_cost, max_cost = _summary_metrics(results_sig, df_results)
+
+    if avg_total_cost is not None:
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Configurations", total_configurations)
+        col2.metric("Average Cost/Piece", f"€{avg_total_cost:.3f}")
+        col3.metric("Min Cost/Piece", f"€{min_cost:.3f}")
+        col4.metric("Max Cost/Piece", f"€{max_cost:.3f}")
+
+    # Results Table
+    st.subheader("Summary Results")
+
+    # Cached columnar frame: rebuilt only when the results change, not on
+    # every rerun of the fragment. Numeric columns stay numeric; currency
+    # formatting is applied at display time via column_config.
+    df_summary = _summary_df(results_sig, results)
+    st.dataframe(
+        df_summary,
+        use_container_width=True,
+        column_config=_SUMMARY_COLUMN_CONFIG,
+    )
+
+    # Detailed Breakdown
+    if show_detailed_breakdown:
+        st.subheader("Detailed Cost Breakdown")
+
+        # The whole breakdown as one Arrow payload: the grid sorts and
+        # filters client-side, so the common case needs no widgets at all.
+        st.dataframe(
+            df_results,
+            use_container_width=True,
+            hide_index=True,
+        )
+
+        if st.checkbox("Per-configuration view"):
+            # Render one page of expanders at a time so the work per rerun is
+            # O(page size) instead of O(results).
+            BREAKDOWN_PAGE_SIZE = 10
+            total_pages = max(1, -(-len(valid_results) // BREAKDOWN_PAGE_SIZE))
+            page = 1
+            if total_pages > 1:
+                page = st.number_input(
+                    "Breakdown page",
+                    min_value=1,
+                    max_value=total_pages,
+                    value=1,
+                    key="breakdown_page",
+                )
+            start = (page - 1) * BREAKDOWN_PAGE_SIZE
+            page_results = valid_results[start:start + BREAKDOWN_PAGE_SIZE]
+            if total_pages > 1:
+                st.caption(
+                    f"Showing {start + 1}-{start + len(page_results)} of {len(valid_results)} configurations"
+                )
+
+            for i, result in enumerate(page_results):
+                row = _ROW_DEFAULTS | result
+                material_desc = f"{row['material_id']} - {row['material_desc']}"
+                supplier_desc = row.get('supplier_label') or f"{row['supplier_id']} - {row['supplier_name']}"
+
+                with st.expander(f"📦 {material_desc} | 🏭 {supplier_desc}"):
+                    st.markdown(
+                        f"Total cost: €{row['total_cost_per_piece']:.3f}/piece · "
+                        f"Annual: €{row['total_annual_cost']:,.0f}"
+                    )
+                    # The expander body runs even while collapsed, so the
+                    # four-tab subtree is only built once the user asks.
+                    if st.toggle(
+                        "Show full details",
+                        key=f"detail_{row['material_id']}_{row['supplier_id']}",
+                    ):
+                        tab1, tab2, tab3, tab4 = st.tabs(["Cost Components", "Material Details", "Supply Chain", "Packaging Details"])
+
+                        with tab1:
+                            c1, c2 = st.columns(2)
+                            with c1:
+                                # One markdown payload per column instead of one
+                                # websocket message per line.
+                                st.markdown(
+                                    "**💰 Cost Breakdown per Piece:**\n"
+                                    + "\n".join(
+                                        _EUR_LINE(name=name, v=row[key])
+                                        for name, key in _BREAKDOWN_PAIRS
+                                    )
+                                    + f"\n\n**🎯 Total per Piece: €{row['total_cost_per_piece']:.3f}**"
+                                )
+
+                            with c2:
+                                st.markdown(
+                                    "**📊 Annual Calculations:**\n"
+                                    f"- Annual Volume: {row['Annual Volume']:,} pieces\n"
+                                    f"- Total Annual Cost: €{row['total_annual_cost']:,.0f}"
+                                )
+
+                                total_cost = row['total_cost_per_piece']
+                                if total_cost > 0:
+                                    # One chart payload instead of a text line per
+                                    # component; the division stays vectorized.
+                                    vals = np.fromiter(
+                                        (row[k] for k in _COMP_KEYS),
+                                        dtype=np.float64,
+                                        count=len(_COMP_KEYS),
+                                    )
+                                    shares = pd.Series(vals * (100.0 / total_cost), index=_COMP_NAMES)
+                                    st.markdown("**📈 Cost Distribution (%):**")
+                                    st.bar_chart(shares[shares > 0])
+
+                        with tab2:
+                            _two_col_markdown(
+                                "**📦 Material Information:**\n"
+                                f"- Project: {row['Project Name']}\n"
+                                f"- Material ID: {row['material_id']}\n"
+                                f"- Description: {row['material_desc']}\n"
+                                f"- Annual Volume: {row['Annual Volume']:,}\n"
+                                f"- Price per Piece: €{row['Price (Pcs)']:.2f}\n"
+                                f"- SOP: {row['SOP']}",
+                                "**🏭 Supplier Information:**\n"
+                                f"- Supplier ID: {row['supplier_id']}\n"
+                                f"- Name: {row['supplier_name']}\n"
+                                f"- City: {row['City of Manufacture']}\n"
+                                f"- ZIP: {row['Vendor ZIP']}\n"
+                                f"- Deliveries/Month: {row['Deliveries per Month']}",
+                            )
+
+                        with tab3:
+                            _two_col_markdown(
+                                "**🚚 Transport & Operations:**\n"
+                                f"- Transport Mode: {row['Transport type']}\n"
+                                f"- Transport Cost/LU: €{row['Transport cost per LU']:.2f}\n"
+                                f"- Incoterm: {row['Incoterm code']}\n"
+                                f"- Incoterm Place: {row['Incoterm Named Place']}\n"
+                                f"- Lead Time: {row['Lead time (d)']} days",
+                                "**🏬 Warehouse & Inventory:**\n"
+                                f"- Safety Stock (pallets): {row['safety_stock_no_pal']:.1f}\n"
+                                f"- Call-off Type: {row['Call-off transfer type']}\n"
+                                f"- Sub-supplier Used: {row['Sub-Supplier Used']}\n"
+                                f"- Duty Rate: {row['Duty Rate (% Of pcs price)']:.1f}%",
+                            )
+
+                        with tab4:
+                            st.markdown("**📦 Packaging Configuration:**")
+                            active = {label: row[key] for label, key in _LOOP_STAGES if row[key] > 0}
+                            _two_col_markdown(
+                                f"- Packaging Type: {row['packaging_type']}\n"
+                                f"- Filling/Box: {row['Filling degree per box']} pcs\n"
+                                f"- Filling/Pallet: {row['Filling degree per pallet']} pcs\n"
+                                f"- Special Packaging: {row['Special packaging required']}\n"
+                                f"- Packaging Loop: {row['Packaging Loop']} days",
+                                "**🔄 Packaging Loop Details:**"
+                                + "".join(f"\n- {label}: {value} days" for label, value in active.items()),
+                            )
+
+    # Export Results
+    st.markdown("---")
+    st.subheader("📁 Export Results")
+
+    if export_format == "Formatted Excel":
+        st.info("📋 **Formatted Excel Export** - Creates a professional report matching the logistics cost calculation template with proper formatting, colors, and structure.")
+
+        if len(results) > 1:
+            result_options = _result_labels(results_sig, results)
+
+            selected_result_idx = st.selectbox(
+                "Select configuration to export:",
+                range(len(results)),
+                format_func=lambda x: result_options[x],
+            )
+            selected_result = results[selected_result_idx]
+        else:
+            selected_result = results[0]
+
+        colX, colY, colZ = st.columns(3)
+        with colX:
+            plant_id = st.text_input("Plant ID", value="1051")
+        with colY:
+            version = st.text_input("Version", value="1.5.5")
+        with colZ:
+            created_by = st.text_input("Created by", value="System")
+
+        if st.button("📊 Generate Formatted Excel Report", type="primary"):
+            try:
+                # Imported here so the openpyxl chain is only paid for when
+                # a formatted report is actually generated.
+                from utils.excel_exporter import LogisticsExcelExporter
+                excel_exporter = LogisticsExcelExporter()
+                excel_buffer = excel_exporter.create_logistics_report(
+                    selected_result,
+                    plant_id=plant_id,
+                    version=version,
+                    created_by=created_by,
+                )
+
+                material_id = selected_result.get('material_id', 'Material')
+                supplier_id = selected_result.get('supplier_id', 'Supplier')
+                timestamp = pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')
+                filename = f"Logistics_Cost_Report_{material_id}_{supplier_id}_{timestamp}.xlsx"
+
+                st.download_button(
+                    label="📥 Download Formatted Excel Report",
+                    data=excel_buffer,
+                    file_name=filename,
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                )
+                st.success("✅ Formatted Excel report generated successfully!")
+
+            except Exception as e:
+                st.error(f"❌ Error generating formatted Excel: {str(e)}")
+
+    elif export_format == "CSV":
+        # Serialized at render time: the pinned Streamlit's
+        # download_button takes bytes, not callables, and only the
+        # selected format's payload is ever built.
+        st.download_button(
+            label="📄 Download Full Results CSV",
+            data=_df_to_csv_bytes(df_results),
+            file_name=f"logistics_costs_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv",
+        )
+
+    elif export_format == "JSON":
+        # orjson serializes in C (including numpy scalars) and is
+        # several times faster than stdlib json on large result lists.
+        json_bytes = orjson.dumps(
+            results,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+        st.download_button(
+            label="📄 Download JSON",
+            data=json_bytes,
+            file_name=f"logistics_costs_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.json",
+            mime="application/json",
+        )
+
+    # Comparison Analysis
+    if len(results) > 1:
+        st.markdown("---")
+        st.subheader("📊 Comparison Analysis")
+
+        # Dispatch the cheap cases first: with fewer than two valid rows
+        # there is nothing to compare, so the min/max scan, the difference
+        # math and the component table are all skipped.
+        if not valid_results:
+            st.info("No results with a total cost to compare.")
+        elif len(valid_results) == 1:
+            only = valid_results[0]
+            st.info(
+                f"Only one configuration has a total cost: "
+                f"{only['material_id']} - {only['supplier_id']} at "
+                f"€{only['total_cost_per_piece']:.3f}/piece."
+            )
+        else:
+            # The nan reductions run over the vector built at the top of
+            # the fragment; no second column extraction needed.
+            best_config = results[int(np.nanargmin(tcp_all))]
+            worst_config = results[int(np.nanargmax(tcp_all))]
+
+            c1, c2 = st.columns(2)
+            with c1:
+                st.success("**🏆 Best Configuration (Lowest Cost)**")
+                st.markdown(
+                    f"Material: {best_config['material_id']} - {best_config['material_desc']}\n\n"
+                    f"Supplier: {best_config.get('supplier_label', best_config['supplier_id'])}\n\n"
+                    f"Total Cost: €{best_config['total_cost_per_piece']:.3f}/piece\n\n"
+                    f"Annual Cost: €{best_config['total_annual_cost']:,.0f}"
+                )
+
+            with c2:
+                st.error("**📈 Highest Cost Configuration**")
+                st.markdown(
+                    f"Material: {worst_config['material_id']} - {worst_config['material_desc']}\n\n"
+                    f"Supplier: {worst_config.get('supplier_label', worst_config['supplier_id'])}\n\n"
+                    f"Total Cost: €{worst_config['total_cost_per_piece']:.3f}/piece\n\n"
+                    f"Annual Cost: €{worst_config['total_annual_cost']:,.0f}"
+                )
+
+            cost_difference = worst_config['total_cost_per_piece'] - best_config['total_cost_per_piece']
+            cost_difference_pct = (cost_difference / best_config['total_cost_per_piece']) * 100 if best_config['total_cost_per_piece'] > 0 else 0
+
+            st.info(f"**💡 Cost Difference:** €{cost_difference:.3f}/piece ({cost_difference_pct:.1f}% higher)")
+
+            st.subheader("Component Cost Comparison")
+            df_comparison = _comparison_df(
+                (best_config.get('material_id'), best_config.get('supplier_id'),
+                 best_config.get('total_cost_per_piece')),
+                (worst_config.get('material_id'), worst_config.get('supplier_id'),
+                 worst_config.get('total_cost_per_piece')),
+                best_config,
+                worst_config,
+            )
+            st.dataframe(
+                df_comparison.style.format(
+                    {'Best Config': '€{:.3f}', 'Worst Config': '€{:.3f}', 'Difference': '€{:.3f}'}
+                ),
+                use_container_width=True,
+            )
+
 
 def main():
     st.title("Cost Calculation & Results")
@@ -20,20 +784,20 @@ def main():
         st.session_state.data_manager = DataManager()
 
     data_manager = st.session_state.data_manager
-    calculator = LogisticsCostCalculator()
-    excel_exporter = LogisticsExcelExporter()
-
-    # Load All Configurations
-    materials = data_manager.get_materials()
-    suppliers = data_manager.get_suppliers()
-    operations = data_manager.get_operations()
-    packaging_configs = data_manager.get_packaging()
-    repacking_configs = data_manager.get_repacking()
-    transport_configs = data_manager.get_transport()
-    co2_configs = data_manager.get_co2()
-    warehouse_configs = data_manager.get_warehouse()
-    interest_configs = data_manager.get_interest()
-    additional_costs = data_manager.get_additional_costs()
+    calculator = _get_calculator()
+
+    # Load All Configurations (one cached lookup keyed on the data version)
+    configs = _load_all_configs(data_manager.version, data_manager)
+    materials = configs['materials']
+    suppliers = configs['suppliers']
+    operations = configs['operations']
+    packaging_configs = configs['packaging']
+    repacking_configs = configs['repacking']
+    transport_configs = configs['transport']
+    co2_configs = configs['co2']
+    warehouse_configs = configs['warehouse']
+    interest_configs = configs['interest']
+    additional_costs = configs['additional_costs']
 
     # Check Required Data
     missing_configs = []
@@ -65,17 +829,14 @@ def main():
         "Additional": len(additional_costs),
     }
 
-    col1, col2, col3, col4 = st.columns(4)
+    cols = st.columns(4)
     config_items = list(config_counts.items())
 
-    for i, col in enumerate([col1, col2, col3, col4]):
-        with col:
-            for j in range(3):  # 3 items per column
-                idx = i * 3 + j
-                if idx < len(config_items):
-                    name, count = config_items[idx]
-                    status = "✅" if count > 0 else "❌"
-                    col.metric(f"{status} {name}", count)
+    # 3 items per column, no index arithmetic or bounds check per cell
+    chunks = [config_items[i * 3:(i + 1) * 3] for i in range(4)]
+    for col, chunk in zip(cols, chunks):
+        for name, count in chunk:
+            col.metric(f"{_STATUS[bool(count)]} {name}", count)
 
     st.markdown("---")
 
@@ -102,7 +863,9 @@ def main():
         # Quick mode - show what will be used
         st.info("📋 **Quick Mode**: Using first available configuration for each component")
 
-        with st.expander("🔍 View Configurations to be Used"):
+        # An expander body executes even while collapsed; a toggle skips
+        # the label building entirely until the user opts in.
+        if st.toggle("🔍 View Configurations to be Used"):
             colA, colB = st.columns(2)
 
             with colA:
@@ -139,7 +902,9 @@ def main():
                         f"**Interest:** {interest_configs[0].get('rate',0)}%"
                     )
                 if additional_costs:
-                    total_additional = sum(c.get('cost_value', 0) for c in additional_costs)
+                    total_additional = _sum_cost_values(
+                        tuple(c.get('cost_value', 0) for c in additional_costs)
+                    )
                     st.write(f"**Additional Costs:** €{total_additional:.2f} total")
                 else:
                     st.write("**Additional Costs:** None")
@@ -147,26 +912,27 @@ def main():
 
         # Material-Supplier selection for quick mode
         st.subheader("📦 Select Material-Supplier Pairs")
-        available_pairs = data_manager.get_material_supplier_pairs()
+        available_pairs = _cached_pairs(materials, suppliers, data_manager)
 
         if not available_pairs:
             st.warning("No material-supplier pairs found.")
             return
 
+        pair_by_id = {pair['pair_id']: pair for pair in available_pairs}
+
         selected_pair_ids = st.multiselect(
             "Choose Material-Supplier pairs for calculation:",
             options=[pair['pair_id'] for pair in available_pairs],
             default=[pair['pair_id'] for pair in available_pairs[:5]],
-            format_func=lambda x: next(pair['display_name'] for pair in available_pairs if pair['pair_id'] == x),
+            format_func=lambda x: pair_by_id[x]['display_name'],
         )
 
         if not selected_pair_ids:
             st.warning("Please select at least one Material-Supplier pair.")
             return
 
-        selected_material_supplier_pairs = [
-            pair for pair in available_pairs if pair['pair_id'] in selected_pair_ids
-        ]
+        # O(selected) dict lookups; no per-pair scan of the selection list
+        selected_material_supplier_pairs = [pair_by_id[pid] for pid in selected_pair_ids]
 
         # Set default configs for quick mode
         selected_configs = {
@@ -211,6 +977,11 @@ def main():
 
         # Tab 1: Material & Supplier
         with config_tabs[0]:
+            # O(1) lookups for the format_funcs below; the old inline
+            # next(...) scans made option rendering O(N^2).
+            mat_by_no = {m['material_no']: m for m in materials}
+            sup_by_id = {s['vendor_id']: s for s in suppliers}
+
             colL, colR = st.columns(2)
 
             with colL:
@@ -221,7 +992,7 @@ def main():
                         "Select Materials:",
                         options=[m['material_no'] for m in materials],
                         default=[materials[-1]['material_no']],
-                        format_func=lambda x: f"{x} - {next(m['material_desc'] for m in materials if m['material_no'] == x)}",
+                        format_func=lambda x: f"{x} - {mat_by_no[x]['material_desc']}",
                     )
                 else:
                     selected_material_ids = []
@@ -235,7 +1006,7 @@ def main():
                         "Select Suppliers:",
                         options=[s['vendor_id'] for s in suppliers],
                         default=[suppliers[-1]['vendor_id']],
-                        format_func=lambda x: f"{x} - {next(s['vendor_name'] for s in suppliers if s['vendor_id'] == x)}",
+                        format_func=lambda x: f"{x} - {sup_by_id[x]['vendor_name']}",
                     )
                 else:
                     selected_supplier_ids = []
@@ -243,18 +1014,18 @@ def main():
 
             # Generate Material-Supplier pairs
             if selected_material_ids and selected_supplier_ids:
-                selected_materials = [m for m in materials if m['material_no'] in selected_material_ids]
-                selected_suppliers = [s for s in suppliers if s['vendor_id'] in selected_supplier_ids]
-
-                for material in selected_materials:
-                    for sup in selected_suppliers:
-                        pair = {
-                            'material': material,
-                            'supplier': sup,
-                            'pair_id': f"{material['material_no']}_{sup['vendor_id']}",
-                            'display_name': f"{material['material_no']} - {material['material_desc']} | {sup['vendor_id']} - {sup['vendor_name']}",
-                        }
-                        selected_material_supplier_pairs.append(pair)
+                selected_materials = [mat_by_no[mid] for mid in selected_material_ids]
+                selected_suppliers = [sup_by_id[sid] for sid in selected_supplier_ids]
+
+                selected_material_supplier_pairs = [
+                    {
+                        'material': material,
+                        'supplier': sup,
+                        'pair_id': f"{material['material_no']}_{sup['vendor_id']}",
+                        'display_name': f"{material['material_no']} - {material['material_desc']} | {sup['vendor_id']} - {sup['vendor_name']}",
+                    }
+                    for material, sup in itertools.product(selected_materials, selected_suppliers)
+                ]
 
                 st.success(f"✅ Generated {len(selected_material_supplier_pairs)} Material-Supplier combinations")
 
@@ -265,11 +1036,7 @@ def main():
             with colL:
                 st.markdown("### 📍 Location Configuration")
                 if suppliers:
-                    supplier_options = [
-                        f"{s.get('vendor_country','?')} - {s.get('city_of_manufacture','?')} - {s.get('plant','?')} - {s.get('country','?')}"
-                        + (f" ({s.get('distance')} km)" if s.get('distance') is not None else "")
-                        for s in suppliers
-                    ]
+                    supplier_options = _location_labels(suppliers)
                     # Default to the LAST location
                     selected_location_idx = st.selectbox(
                         "Select Location:",
@@ -285,10 +1052,7 @@ def main():
             with colR:
                 st.markdown("### ⚙️ Operations Configuration")
                 if operations:
-                    ops_options = [
-                        f"{op.get('incoterm_code','?')} @ {op.get('incoterm_place','?')} | {op.get('currency','?')} | {op.get('lead_time','?')}d lead time"
-                        for op in operations
-                    ]
+                    ops_options = _operations_labels(operations)
                     # Default to the LAST operations config
                     selected_ops_idx = st.selectbox(
                         "Select Operations:",
@@ -308,10 +1072,7 @@ def main():
             with colL:
                 st.markdown("### 📦 Packaging Configuration")
                 if packaging_configs:
-                    pkg_options = [
-                        f"{pkg.get('box_type','?')} | {pkg.get('pallet_type','?')} | SP: {pkg.get('sp_needed','?')}"
-                        for pkg in packaging_configs
-                    ]
+                    pkg_options = _packaging_labels(packaging_configs)
                     # Default to the LAST packaging config
                     selected_pkg_idx = st.selectbox(
                         "Select Packaging:",
@@ -331,10 +1092,7 @@ def main():
             with colR:
                 st.markdown("### 🔄 Repacking Configuration")
                 if repacking_configs:
-                    rep_options = [
-                        f"{rep.get('pcs_weight','?')} | {rep.get('packaging_one_way','?')}"
-                        for rep in repacking_configs
-                    ]
+                    rep_options = _repacking_labels(repacking_configs)
                     # Default to the LAST repacking config
                     selected_rep_idx = st.selectbox(
                         "Select Repacking:",
@@ -354,12 +1112,7 @@ def main():
             with colA:
                 st.markdown("### 🚚 Transport Configuration")
                 if transport_configs:
-                    trans_options = []
-                    for trans in transport_configs:
-                        if trans.get('auto_calculate', False):
-                            trans_options.append(f"{trans.get('mode1','?')} | Auto-calculated | SF: {trans.get('stack_factor','?')}")
-                        else:
-                            trans_options.append(f"{trans.get('mode1','?')} | €{trans.get('cost_lu',0):.2f}/LU | SF: {trans.get('stack_factor','?')}")
+                    trans_options = _transport_labels(transport_configs)
                     # Default to the LAST transport config
                     selected_trans_idx = st.selectbox(
                         "Select Transport:",
@@ -375,10 +1128,7 @@ def main():
             with colB:
                 st.markdown("### 🌱 CO₂ Configuration")
                 if co2_configs:
-                    co2_options = [
-                        f"€{co2.get('cost_per_ton',0):.0f}/ton | Factor: {co2.get('co2_conversion_factor','?')}"
-                        for co2 in co2_configs
-                    ]
+                    co2_options = _co2_labels(co2_configs)
                     # Default to the LAST CO2 config
                     selected_co2_idx = st.selectbox(
                         "Select CO₂ Config:",
@@ -410,10 +1160,7 @@ def main():
             with colA:
                 st.markdown("### 🏗️ Warehouse Configuration")
                 if warehouse_configs:
-                    wh_options = [
-                        f"€{wh.get('cost_per_loc',0):.2f}/location/month"
-                        for wh in warehouse_configs
-                    ]
+                    wh_options = _warehouse_labels(warehouse_configs)
                     # Default to the LAST warehouse config
                     selected_wh_idx = st.selectbox(
                         "Select Warehouse:",
@@ -429,7 +1176,7 @@ def main():
             with colB:
                 st.markdown("### 💰 Interest Configuration")
                 if interest_configs:
-                    int_options = [f"{intr.get('rate',0):.2f}% annual" for intr in interest_configs]
+                    int_options = _interest_labels(interest_configs)
                     # Default to the LAST interest config
                     selected_int_idx = st.selectbox(
                         "Select Interest:",
@@ -461,71 +1208,13 @@ def main():
     if selected_material_supplier_pairs:
         st.markdown("---")
         st.subheader("📊 Selected Configuration Summary")
+        _render_config_summary(selected_configs, len(selected_material_supplier_pairs))
 
-        col1, col2, col3 = st.columns(3)
-
-        with col1:
-            st.write(f"**Material-Supplier Pairs:** {len(selected_material_supplier_pairs)}")
-            location_name = (
-                selected_configs.get('location', {}).get('plant', 'Not selected')
-                if selected_configs.get('location')
-                else 'Not selected'
-            )
-            st.write(f"**Location:** {location_name}")
-            operations_name = (
-                selected_configs.get('operations', {}).get('incoterm_code', 'Not selected')
-                if selected_configs.get('operations')
-                else 'Not selected'
-            )
-            st.write(f"**Operations:** {operations_name}")
-            packaging_name = (
-                selected_configs.get('packaging', {}).get('box_type', 'Not selected')
-                if selected_configs.get('packaging')
-                else 'Not selected'
-            )
-            st.write(f"**Packaging:** {packaging_name}")
-
-        with col2:
-            transport_name = (
-                selected_configs.get('transport', {}).get('mode1', 'Not selected')
-                if selected_configs.get('transport')
-                else 'Not selected'
-            )
-            st.write(f"**Transport:** {transport_name}")
-            co2_cost = (
-                selected_configs.get('co2', {}).get('cost_per_ton', 0)
-                if selected_configs.get('co2')
-                else 0
-            )
-            st.write(f"**CO₂:** €{co2_cost}/ton")
-            warehouse_cost = (
-                selected_configs.get('warehouse', {}).get('cost_per_loc', 0)
-                if selected_configs.get('warehouse')
-                else 0
-            )
-            st.write(f"**Warehouse:** €{warehouse_cost}/loc")
-            duty_rate = selected_configs.get('duty_rate_percent', 0)
-            st.write(f"**Duty Rate:** {duty_rate}%")
-
-        with col3:
-            repacking_name = (
-                selected_configs.get('repacking', {}).get('pcs_weight', 'Not selected')
-                if selected_configs.get('repacking')
-                else 'Not selected'
-            )
-            st.write(f"**Repacking:** {repacking_name}")
-            interest_rate = (
-                selected_configs.get('interest', {}).get('rate', 0)
-                if selected_configs.get('interest')
-                else 0
-            )
-            st.write(f"**Interest:** {interest_rate}%")
-            additional_total = sum(c.get('cost_value', 0) for c in selected_configs.get('additional_costs', []))
-            st.write(f"**Additional Costs:** €{additional_total:.2f}")
-
-        # Validation
+        # Validation: four dict lookups, cheaper than any memo key.
         required_configs = ['packaging', 'transport', 'warehouse', 'co2']
-        missing_required = [cfg for cfg in required_configs if not selected_configs.get(cfg)]
+        missing_required = [
+            cfg for cfg in required_configs if not selected_configs.get(cfg)
+        ]
 
         if missing_required:
             st.error(f"❌ Missing required configurations: {', '.join(missing_required)}")
@@ -533,12 +1222,6 @@ def main():
         else:
             st.success("✅ All required configurations selected")
 
-    # Export Format Selection
-    st.markdown("---")
-    st.subheader("📁 Export Settings")
-    export_format = st.selectbox("Export Format", options=["Formatted Excel", "CSV", "JSON"])
-    show_detailed_breakdown = st.checkbox("Show Detailed Breakdown", value=True)
-
     # Run Calculation
     if st.button("🚀 Calculate Logistics Costs", type="primary", use_container_width=True):
         if not selected_material_supplier_pairs:
@@ -547,32 +1230,29 @@ def main():
 
         with st.spinner("Calculating logistics costs..."):
             try:
-                results = []
-
-                # Calculate for each selected pair with selected configurations
-                for pair in selected_material_supplier_pairs:
-                    material = pair['material']
-                    supplier_rec = pair['supplier']  # renamed to avoid shadowing
-
-                    result = calculator.calculate_total_logistics_cost(
-                        material=material,
-                        supplier=supplier_rec,
-                        packaging_config=selected_configs['packaging'],
-                        transport_config=selected_configs['transport'],
-                        warehouse_config=selected_configs['warehouse'],
-                        repacking_config=selected_configs['repacking'],
-                        duty_rate_percent=selected_configs.get('duty_rate_percent', 0),
-                        co2_config=selected_configs['co2'],
-                        additional_costs=selected_configs['additional_costs'],
-                        operations_config=selected_configs['operations'],
-                        inventory_config=selected_configs['interest'],
-                    )
-
-                    if result:
-                        results.append(result)
+                # Cache keys are content-based: the pair payload carries the
+                # material and supplier dicts, so editing either produces a
+                # new key instead of serving stale disk-persisted results
+                # for the same pair selection.
+                pairs_key = json.dumps(selected_material_supplier_pairs, sort_keys=True, default=str)
+                configs_key = json.dumps(selected_configs, sort_keys=True, default=str)
+
+                # The shared instance would otherwise carry warnings over
+                # from the previous run.
+                calculator.clear_errors()
+                results = _compute_results(
+                    pairs_key,
+                    configs_key,
+                    selected_material_supplier_pairs,
+                    selected_configs,
+                    calculator,
+                )
 
                 if results:
                     st.session_state.calculation_results = results
+                    # The compute cache key doubles as the signature for
+                    # every frame derived from these results downstream.
+                    st.session_state.calculation_sig = (pairs_key, configs_key)
                     st.success(f"✅ Calculation completed! {len(results)} configurations processed.")
 
                     errors = calculator.get_calculation_errors()
@@ -589,291 +1269,14 @@ def main():
                             st.error(f"• {error}")
 
             except Exception as e:
+                logger.exception("Error during cost calculation")
                 st.error(f"❌ Error during calculation: {str(e)}")
-                import traceback
-                st.error(traceback.format_exc())
+                with st.expander("Show traceback"):
+                    st.code(traceback.format_exc(), language='python')
                 return
 
-    # Display Results
-    if 'calculation_results' in st.session_state and st.session_state.calculation_results:
-        results = st.session_state.calculation_results
-        st.markdown("---")
-        st.subheader("📈 Calculation Results")
-
-        # Summary metrics
-        total_configurations = len(results)
-        total_costs = [r['total_cost_per_piece'] for r in results if r.get('total_cost_per_piece') is not None]
-
-        if total_costs:
-            avg_total_cost = sum(total_costs) / len(total_costs)
-            min_cost = min(total_costs)
-            max_cost = max(total_costs)
-
-            col1, col2, col3, col4 = st.columns(4)
-            col1.metric("Configurations", total_configurations)
-            col2.metric("Average Cost/Piece", f"€{avg_total_cost:.3f}")
-            col3.metric("Min Cost/Piece", f"€{min_cost:.3f}")
-            col4.metric("Max Cost/Piece", f"€{max_cost:.3f}")
-
-        # Results Table
-        st.subheader("Summary Results")
-
-        summary_data = []
-        for r in results:
-            summary_data.append({
-                'Material ID': r.get('material_id', ''),
-                'Material Description': r.get('material_desc', ''),
-                'Supplier ID': r.get('supplier_id', ''),
-                'Supplier Name': r.get('supplier_name', ''),
-                'Total Cost/Piece': f"€{r.get('total_cost_per_piece', 0):.3f}",
-                'Packaging Cost': f"€{r.get('packaging_cost_per_piece', 0):.3f}",
-                'Transport Cost': f"€{r.get('transport_cost_per_piece', 0):.3f}",
-                'Warehouse Cost': f"€{r.get('warehouse_cost_per_piece', 0):.3f}",
-                'CO₂ Cost': f"€{r.get('co2_cost_per_piece', 0):.3f}",
-                'Logistics cost supplier (pcs)': f"€{r.get('total_cost_per_piece', 0):.3f}",
-                'Logistics cost supplier (year)': f"€{r.get('total_annual_cost', 0):,.0f}",
-            })
-
-        df_summary = pd.DataFrame(summary_data)
-        st.dataframe(df_summary, use_container_width=True)
-
-        # Detailed Breakdown
-        if show_detailed_breakdown:
-            st.subheader("Detailed Cost Breakdown")
-
-            for i, result in enumerate(results):
-                material_desc = f"{result.get('material_id', '')} - {result.get('material_desc', '')}"
-                supplier_desc = f"{result.get('supplier_id', '')} - {result.get('supplier_name', '')}"
-
-                with st.expander(f"📦 {material_desc} | 🏭 {supplier_desc}"):
-                    tab1, tab2, tab3, tab4 = st.tabs(["Cost Components", "Material Details", "Supply Chain", "Packaging Details"])
-
-                    with tab1:
-                        c1, c2 = st.columns(2)
-                        with c1:
-                            st.write("**💰 Cost Breakdown per Piece:**")
-                            st.write(f"• Packaging: €{result.get('packaging_cost_per_piece', 0):.3f}")
-                            st.write(f"• Repacking: €{result.get('repacking_cost_per_piece', 0):.3f}")
-                            st.write(f"• Transport: €{result.get('transport_cost_per_piece', 0):.3f}")
-                            st.write(f"• Warehouse: €{result.get('warehouse_cost_per_piece', 0):.3f}")
-                            st.write(f"• Customs: €{result.get('customs_cost_per_piece', 0):.3f}")
-                            st.write(f"• CO₂: €{result.get('co2_cost_per_piece', 0):.3f}")
-                            st.write(f"• Additional: €{result.get('additional_cost_per_piece', 0):.3f}")
-                            st.write(f"**🎯 Total per Piece: €{result.get('total_cost_per_piece', 0):.3f}**")
-
-                        with c2:
-                            st.write("**📊 Annual Calculations:**")
-                            st.write(f"• Annual Volume: {result.get('Annual Volume', 0):,} pieces")
-                            st.write(f"• Total Annual Cost: €{result.get('total_annual_cost', 0):,.0f}")
-
-                            total_cost = result.get('total_cost_per_piece', 0)
-                            if total_cost > 0:
-                                st.write("**📈 Cost Distribution:**")
-                                costs = {
-                                    'Packaging': result.get('packaging_cost_per_piece', 0),
-                                    'Transport': result.get('transport_cost_per_piece', 0),
-                                    'Warehouse': result.get('warehouse_cost_per_piece', 0),
-                                    'CO₂': result.get('co2_cost_per_piece', 0),
-                                    'Customs': result.get('customs_cost_per_piece', 0),
-                                    'Repacking': result.get('repacking_cost_per_piece', 0),
-                                    'Additional': result.get('additional_cost_per_piece', 0),
-                                }
-                                for component, cost in costs.items():
-                                    if cost > 0:
-                                        percentage = (cost / total_cost) * 100
-                                        st.write(f"• {component}: {percentage:.1f}%")
-
-                    with tab2:
-                        c1, c2 = st.columns(2)
-                        with c1:
-                            st.write("**📦 Material Information:**")
-                            st.write(f"• Project: {result.get('Project Name', 'N/A')}")
-                            st.write(f"• Material ID: {result.get('material_id', 'N/A')}")
-                            st.write(f"• Description: {result.get('material_desc', 'N/A')}")
-                            st.write(f"• Annual Volume: {result.get('Annual Volume', 0):,}")
-                            st.write(f"• Price per Piece: €{result.get('Price (Pcs)', 0):.2f}")
-                            st.write(f"• SOP: {result.get('SOP', 'N/A')}")
-
-                        with c2:
-                            st.write("**🏭 Supplier Information:**")
-                            st.write(f"• Supplier ID: {result.get('supplier_id', 'N/A')}")
-                            st.write(f"• Name: {result.get('supplier_name', 'N/A')}")
-                            st.write(f"• City: {result.get('City of Manufacture', 'N/A')}")
-                            st.write(f"• ZIP: {result.get('Vendor ZIP', 'N/A')}")
-                            st.write(f"• Deliveries/Month: {result.get('Deliveries per Month', 0)}")
-
-                    with tab3:
-                        c1, c2 = st.columns(2)
-                        with c1:
-                            st.write("**🚚 Transport & Operations:**")
-                            st.write(f"• Transport Mode: {result.get('Transport type', 'N/A')}")
-                            st.write(f"• Transport Cost/LU: €{result.get('Transport cost per LU', 0):.2f}")
-                            st.write(f"• Incoterm: {result.get('Incoterm code', 'N/A')}")
-                            st.write(f"• Incoterm Place: {result.get('Incoterm Named Place', 'N/A')}")
-                            st.write(f"• Lead Time: {result.get('Lead time (d)', 0)} days")
-
-                        with c2:
-                            st.write("**🏬 Warehouse & Inventory:**")
-                            st.write(f"• Safety Stock (pallets): {result.get('safety_stock_no_pal', 0):.1f}")
-                            st.write(f"• Call-off Type: {result.get('Call-off transfer type', 'N/A')}")
-                            st.write(f"• Sub-supplier Used: {result.get('Sub-Supplier Used', 'N/A')}")
-                            st.write(f"• Duty Rate: {result.get('Duty Rate (% Of pcs price)', 0):.1f}%")
-
-                    with tab4:
-                        st.write("**📦 Packaging Configuration:**")
-                        c1, c2 = st.columns(2)
-                        with c1:
-                            st.write(f"• Packaging Type: {result.get('packaging_type', 'N/A')}")
-                            st.write(f"• Filling/Box: {result.get('Filling degree per box', 0)} pcs")
-                            st.write(f"• Filling/Pallet: {result.get('Filling degree per pallet', 0)} pcs")
-                            st.write(f"• Special Packaging: {result.get('Special packaging required', 'N/A')}")
-                            st.write(f"• Packaging Loop: {result.get('Packaging Loop', 0)} days")
-
-                        with c2:
-                            st.write("**🔄 Packaging Loop Details:**")
-                            loop_stages = [
-                                ('Goods Receipt', 'goods_receipt'),
-                                ('Stock Raw Materials', 'stock_raw_materials'),
-                                ('Production', 'production'),
-                                ('Empties Return', 'empties_return'),
-                                ('Cleaning', 'cleaning'),
-                                ('Dispatch', 'dispatch'),
-                            ]
-                            for label, key in loop_stages:
-                                value = result.get(key, 0)
-                                if value > 0:
-                                    st.write(f"• {label}: {value} days")
-
-        # Export Results
-        st.markdown("---")
-        st.subheader("📁 Export Results")
-
-        if export_format == "Formatted Excel":
-            st.info("📋 **Formatted Excel Export** - Creates a professional report matching the logistics cost calculation template with proper formatting, colors, and structure.")
-
-            if len(results) > 1:
-                result_options = []
-                for i, r in enumerate(results):
-                    material_desc = f"{r.get('material_id', '')} - {r.get('material_desc', '')}"
-                    supplier_desc = f"{r.get('supplier_id', '')} - {r.get('supplier_name', '')}"
-                    result_options.append(f"{material_desc} | {supplier_desc}")
-
-                selected_result_idx = st.selectbox(
-                    "Select configuration to export:",
-                    range(len(results)),
-                    format_func=lambda x: result_options[x],
-                )
-                selected_result = results[selected_result_idx]
-            else:
-                selected_result = results[0]
-
-            colX, colY, colZ = st.columns(3)
-            with colX:
-                plant_id = st.text_input("Plant ID", value="1051")
-            with colY:
-                version = st.text_input("Version", value="1.5.5")
-            with colZ:
-                created_by = st.text_input("Created by", value="System")
-
-            if st.button("📊 Generate Formatted Excel Report", type="primary"):
-                try:
-                    excel_buffer = excel_exporter.create_logistics_report(
-                        selected_result,
-                        plant_id=plant_id,
-                        version=version,
-                        created_by=created_by,
-                    )
-
-                    material_id = selected_result.get('material_id', 'Material')
-                    supplier_id = selected_result.get('supplier_id', 'Supplier')
-                    timestamp = pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')
-                    filename = f"Logistics_Cost_Report_{material_id}_{supplier_id}_{timestamp}.xlsx"
-
-                    st.download_button(
-                        label="📥 Download Formatted Excel Report",
-                        data=excel_buffer,
-                        file_name=filename,
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    )
-                    st.success("✅ Formatted Excel report generated successfully!")
-
-                except Exception as e:
-                    st.error(f"❌ Error generating formatted Excel: {str(e)}")
-
-        elif export_format == "CSV":
-            df_export = pd.DataFrame(results)
-            csv_data = df_export.to_csv(index=False)
-            st.download_button(
-                label="📄 Download Full Results CSV",
-                data=csv_data,
-                file_name=f"logistics_costs_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv",
-            )
-
-        elif export_format == "JSON":
-            json_data = json.dumps(results, indent=2, default=str)
-            st.download_button(
-                label="📄 Download JSON",
-                data=json_data,
-                file_name=f"logistics_costs_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.json",
-                mime="application/json",
-            )
-
-        # Comparison Analysis
-        if len(results) > 1:
-            st.markdown("---")
-            st.subheader("📊 Comparison Analysis")
-
-            valid_results = [r for r in results if r.get('total_cost_per_piece') is not None]
-            if valid_results:
-                best_config = min(valid_results, key=lambda x: x['total_cost_per_piece'])
-                worst_config = max(valid_results, key=lambda x: x['total_cost_per_piece'])
-
-                c1, c2 = st.columns(2)
-                with c1:
-                    st.success("**🏆 Best Configuration (Lowest Cost)**")
-                    st.write(f"Material: {best_config['material_id']} - {best_config['material_desc']}")
-                    st.write(f"Supplier: {best_config['supplier_id']} - {best_config['supplier_name']}")
-                    st.write(f"Total Cost: €{best_config['total_cost_per_piece']:.3f}/piece")
-                    st.write(f"Annual Cost: €{best_config['total_annual_cost']:,.0f}")
-
-                with c2:
-                    st.error("**📈 Highest Cost Configuration**")
-                    st.write(f"Material: {worst_config['material_id']} - {worst_config['material_desc']}")
-                    st.write(f"Supplier: {worst_config['supplier_id']} - {worst_config['supplier_name']}")
-                    st.write(f"Total Cost: €{worst_config['total_cost_per_piece']:.3f}/piece")
-                    st.write(f"Annual Cost: €{worst_config['total_annual_cost']:,.0f}")
-
-                cost_difference = worst_config['total_cost_per_piece'] - best_config['total_cost_per_piece']
-                cost_difference_pct = (cost_difference / best_config['total_cost_per_piece']) * 100 if best_config['total_cost_per_piece'] > 0 else 0
-
-                st.info(f"**💡 Cost Difference:** €{cost_difference:.3f}/piece ({cost_difference_pct:.1f}% higher)")
-
-                st.subheader("Component Cost Comparison")
-                components = [
-                    'packaging_cost_per_piece',
-                    'transport_cost_per_piece',
-                    'warehouse_cost_per_piece',
-                    'co2_cost_per_piece',
-                    'customs_cost_per_piece',
-                    'repacking_cost_per_piece',
-                ]
-
-                comparison_data = []
-                for comp in components:
-                    comp_name = comp.replace('_cost_per_piece', '').replace('_', ' ').title()
-                    comparison_data.append({
-                        'Component': comp_name,
-                        'Best Config': f"€{best_config.get(comp, 0):.3f}",
-                        'Worst Config': f"€{worst_config.get(comp, 0):.3f}",
-                        'Difference': f"€{worst_config.get(comp, 0) - best_config.get(comp, 0):.3f}",
-                    })
-
-                df_comparison = pd.DataFrame(comparison_data)
-                st.dataframe(df_comparison, use_container_width=True)
-
-    else:
-        st.info("No calculation results available. Please run the calculation first.")
+    # Display Results (fragment-scoped)
+    _render_results()
 
 
 if __name__ == "__main__":
@@ -1,51 +1,65 @@
 # pages/12Supplier_Data_Management.py
 import streamlit as st
 import pandas as pd
+import numpy as np
 from utils.data_manager import DataManager
-from utils.supplier_database import SupplierDatabase
-import json
+from utils.supplier_database import SupplierDatabase, normalize_supplier_record
+import orjson
 from datetime import datetime
+from pathlib import Path
 
 st.set_page_config(page_title="Supplier Data Management", page_icon="🏭", layout="wide")
 
-# --- helper: normalize a supplier record to guarantee required keys exist ---
-def normalize_supplier_record(s: dict) -> dict:
-    """Normalize supplier record to ensure all required keys exist with proper names"""
-    s = dict(s or {})
-    
-    # Fill required keys with safe defaults - using CORRECT key names
-    defaults = {
-        'vendor_id': '',
-        'vendor_zip': '',
-        'vendor_name': '',
-        'vendor_country': '',
-        'city_of_manufacture': '',
-        'delivery_performance': 0.0,
-        'deliveries_per_month': 0,
-        'plant': '',        # KB/Bendix plant
-        'country': '',      # KB/Bendix country
-        'distance': 0.0,
-    }
-    
-    for k, v in defaults.items():
-        if k not in s or s[k] is None:
-            s[k] = v
-    
-    # Coerce numerics
-    try:
-        s['delivery_performance'] = float(s.get('delivery_performance', 0.0) or 0.0)
-    except Exception:
-        s['delivery_performance'] = 0.0
-    try:
-        s['deliveries_per_month'] = int(s.get('deliveries_per_month', 0) or 0)
-    except Exception:
-        s['deliveries_per_month'] = 0
-    try:
-        s['distance'] = float(s.get('distance', 0.0) or 0.0)
-    except Exception:
-        s['distance'] = 0.0
-    
-    return s
+# Raw-record -> display-column mapping, shared by Tab 1 and Tab 4.
+_COLUMN_MAP = {
+    'vendor_id': 'Vendor ID',
+    'vendor_zip': 'Vendor ZIP',
+    'vendor_name': 'Vendor Name',
+    'vendor_country': 'Vendor Country',
+    'city_of_manufacture': 'City of Manufacture',
+    'delivery_performance': 'Delivery Performance (%)',
+    'deliveries_per_month': 'Deliveries per Month',
+    'plant': 'KB/Bendix Plant',
+    'distance': 'Distance (km)',
+    'country': 'KB/Bendix Country',
+}
+_DISPLAY_COLS = ['Index'] + list(_COLUMN_MAP.values())
+
+# Typed structured-array layout for the display buffer. Records coming out
+# of SupplierDatabase are already normalized, so the numeric fields can be
+# packed straight into fixed-width columns without per-cell coercion.
+def _records_to_display_df(records) -> pd.DataFrame:
+    """Build the display DataFrame from normalized supplier records.
+
+    Numeric columns are packed with np.fromiter, which stays in C; the
+    string columns stay object-dtype lists, since fixed-width NumPy
+    unicode fields would silently truncate long vendor or city names.
+    """
+    recs = list(records)
+    if not recs:
+        return pd.DataFrame(columns=_DISPLAY_COLS)
+
+    n = len(recs)
+    df = pd.DataFrame({
+        'vendor_id': [s.get('vendor_id', '') for s in recs],
+        'vendor_zip': [s.get('vendor_zip', '') for s in recs],
+        'vendor_name': [s.get('vendor_name', '') for s in recs],
+        'vendor_country': [s.get('vendor_country', '') for s in recs],
+        'city_of_manufacture': [s.get('city_of_manufacture', '') for s in recs],
+        'delivery_performance': np.fromiter(
+            (s.get('delivery_performance', 0.0) for s in recs), dtype=np.float64, count=n),
+        'deliveries_per_month': np.fromiter(
+            (s.get('deliveries_per_month', 0) for s in recs), dtype=np.int64, count=n),
+        'plant': [s.get('plant', '') for s in recs],
+        'distance': np.fromiter(
+            (s.get('distance', 0.0) for s in recs), dtype=np.float64, count=n),
+        'country': [s.get('country', '') for s in recs],
+    })
+    for col in ('delivery_performance', 'distance'):
+        df[col] = df[col].map('{:.1f}'.format)
+    df.insert(0, 'Index', range(1, len(df) + 1))
+    return df.rename(columns=_COLUMN_MAP).reindex(columns=_DISPLAY_COLS)
+
 
 def main():
     st.title("Supplier Data Management")
@@ -58,18 +72,30 @@ def main():
     if 'supplier_db' not in st.session_state:
         st.session_state.supplier_db = SupplierDatabase()
         try:
-            st.session_state.supplier_db.load_from_json('supplier_database.json')
+            # Parquet is the working copy; fall back to the legacy JSON file
+            if Path('supplier_database.parquet').exists():
+                st.session_state.supplier_db.load_from_parquet('supplier_database.parquet')
+            else:
+                st.session_state.supplier_db.load_from_json('supplier_database.json')
         except:
             pass
     
     data_manager = st.session_state.data_manager
     supplier_db = st.session_state.supplier_db
     
-    # Auto-sync with current supplier configurations on page load
+    # Auto-sync with current supplier configurations on page load.
+    # Every widget interaction reruns this script, so the sync and the
+    # full-database write are gated behind a cheap digest of the supplier
+    # configurations and only run when they actually changed.
     current_suppliers = data_manager.get_suppliers()
     if current_suppliers:
-        supplier_db.sync_with_configurations(current_suppliers)
-        supplier_db.save_to_json('supplier_database.json')
+        sig = hash(tuple(sorted(
+            (s.get('vendor_id', ''), tuple(sorted((k, str(v)) for k, v in s.items())))
+            for s in current_suppliers
+        )))
+        if st.session_state.get('_sup_sig') != sig:
+            supplier_db.sync_with_configurations(current_suppliers)
+            st.session_state['_sup_sig'] = sig
     
     tab1, tab2, tab3, tab4 = st.tabs(["📊 View Database", "➕ Add/Edit/Delete Supplier", "📁 Import/Export", "🔍 Search & Filter"])
     
@@ -84,27 +110,21 @@ def main():
             col2.metric("Total Countries", stats.get('total_countries', 0))
             col3.metric("Synced with Configurations", "✅ Yes")
             
-            display_data = []
-            for idx, (vendor_id, supplier_data) in enumerate(supplier_db.database.items(), 1):
-                s = normalize_supplier_record(supplier_data)
-                display_data.append({
-                    'Index': idx,
-                    'Vendor ID': s.get('vendor_id', ''),
-                    'Vendor ZIP': s.get('vendor_zip', ''),
-                    'Vendor Name': s.get('vendor_name', ''),
-                    'Vendor Country': s.get('vendor_country', ''),
-                    'City of Manufacture': s.get('city_of_manufacture', ''),
-                    'Delivery Performance (%)': f"{s.get('delivery_performance', 0.0):.1f}",
-                    'Deliveries per Month': s.get('deliveries_per_month', 0),
-                    'KB/Bendix Plant': s.get('plant', ''),
-                    'Distance (km)': f"{s.get('distance', 0.0):.1f}",
-                    'KB/Bendix Country': s.get('country', '')
-                })
-            
-            if display_data:
-                df_suppliers = pd.DataFrame(display_data)
-                st.dataframe(df_suppliers, use_container_width=True, height=600, hide_index=True)
-                st.info(f"📊 Showing {len(display_data)} supplier records")
+            # Vectorized display build: one DataFrame from the whole database,
+            # formatted column-wise by the shared helper.
+            df_suppliers = _records_to_display_df(supplier_db.database.values())
+
+            if not df_suppliers.empty:
+                # Server-side pagination: only the selected page of rows is
+                # serialized and shipped to the browser, so render cost stays
+                # flat as the database grows.
+                PAGE_SIZE = 100
+                total_pages = max(1, -(-len(df_suppliers) // PAGE_SIZE))
+                page = st.number_input("Page", min_value=1, max_value=total_pages, value=1)
+                start = (page - 1) * PAGE_SIZE
+                df_page = df_suppliers.iloc[start:start + PAGE_SIZE]
+                st.dataframe(df_page, use_container_width=True, height=600, hide_index=True)
+                st.info(f"📊 Showing rows {start + 1}-{start + len(df_page)} of {len(df_suppliers)} supplier records")
             else:
                 st.info("No supplier data in database.")
         else:
@@ -144,7 +164,8 @@ def main():
                     elif supplier_db.supplier_exists(vendor_id):
                         st.error(f"⚠️ The supplier data already exists for Vendor ID: {vendor_id}")
                     else:
-                        supplier_data = normalize_supplier_record({
+                        # add_supplier normalizes on write; no need to wrap here
+                        supplier_db.add_supplier(vendor_id, {
                             'vendor_id': vendor_id,
                             'vendor_name': vendor_name,
                             'vendor_country': vendor_country,
@@ -156,8 +177,6 @@ def main():
                             'country': country,
                             'distance': distance
                         })
-                        supplier_db.add_supplier(vendor_id, supplier_data)
-                        supplier_db.save_to_json('supplier_database.json')
                         st.success(f"Supplier {vendor_id} added successfully!")
                         st.rerun()
         
@@ -172,7 +191,9 @@ def main():
                     format_func=lambda x: f"{x} - {supplier_db.database[x].get('vendor_name', '')}"
                 )
                 
-                supplier_data = normalize_supplier_record(supplier_db.database[selected_supplier_id])
+                # Database records are normalized on write, so the stored
+                # record can seed the form directly.
+                supplier_data = supplier_db.database[selected_supplier_id]
                 
                 with st.form("edit_supplier_form"):
                     st.markdown(f"### Editing: {selected_supplier_id}")
@@ -213,7 +234,9 @@ def main():
                     
                     # Handle form submission
                     if submit_button:
-                        updated_data = normalize_supplier_record({
+                        # update_supplier normalizes exactly once on write
+                        updated_data = {
+                            **supplier_data,
                             'vendor_id': selected_supplier_id,
                             'vendor_name': vendor_name,
                             'vendor_country': vendor_country,
@@ -224,10 +247,9 @@ def main():
                             'plant': plant_val,
                             'country': country_val,
                             'distance': distance
-                        })
+                        }
                         # Update in database
                         supplier_db.update_supplier(selected_supplier_id, updated_data)
-                        supplier_db.save_to_json('supplier_database.json')
                         
                         # Also update in data_manager if it exists there
                         if data_manager.supplier_exists(selected_supplier_id):
@@ -258,7 +280,6 @@ def main():
                 with col1:
                     if st.button("🗑️ Confirm Delete", type="secondary", use_container_width=True):
                         supplier_db.remove_supplier(selected_supplier_id)
-                        supplier_db.save_to_json('supplier_database.json')
                         st.success(f"Supplier {selected_supplier_id} deleted successfully!")
                         st.rerun()
                 
@@ -319,7 +340,6 @@ def main():
                                     supplier_db.add_supplier(vendor_id, supplier_data)
                                     imported_count += 1
                         
-                        supplier_db.save_to_json('supplier_database.json')
                         
                         if imported_count > 0:
                             st.success(f"✅ Successfully imported {imported_count} supplier(s)!")
@@ -331,7 +351,6 @@ def main():
                 with col2:
                     if st.button("🔄 Sync & Overwrite Existing", use_container_width=True):
                         supplier_db.sync_with_configurations(current_suppliers)
-                        supplier_db.save_to_json('supplier_database.json')
                         st.success(f"✅ Synced all {len(current_suppliers)} supplier(s)!")
                         st.rerun()
     
@@ -348,13 +367,14 @@ def main():
                 uploaded_file = st.file_uploader("Choose JSON file", type=['json'])
                 if uploaded_file is not None and st.button("Import JSON Data"):
                     try:
-                        data = json.load(uploaded_file)
-                        raw_db = data.get('database', {})
-                        # normalize everything on import
-                        supplier_db.database = {
-                            vid: normalize_supplier_record(rec) for vid, rec in raw_db.items()
-                        }
-                        supplier_db.save_to_json('supplier_database.json')
+                        # Stream the upload with ijson: records arrive one
+                        # (vendor_id, record) pair at a time instead of
+                        # materializing the whole dump in memory first.
+                        import ijson
+                        supplier_db.database = {}
+                        for vid, rec in ijson.kvitems(uploaded_file, 'database'):
+                            supplier_db.database[vid] = normalize_supplier_record(rec)
+                        supplier_db._invalidate()
                         st.success(f"Successfully imported {len(supplier_db.database)} suppliers!")
                         st.rerun()
                     except Exception as e:
@@ -363,13 +383,23 @@ def main():
                 uploaded_file = st.file_uploader("Choose CSV file", type=['csv'])
                 if uploaded_file is not None and st.button("Import CSV Data"):
                     try:
-                        df = pd.read_csv(uploaded_file)
+                        # pyarrow's CSV reader parses in parallel and, with
+                        # explicit column types, lands the numeric columns
+                        # typed instead of as objects needing coercion.
+                        import pyarrow as pa
+                        import pyarrow.csv as pacsv
+                        table = pacsv.read_csv(
+                            uploaded_file,
+                            convert_options=pacsv.ConvertOptions(column_types={
+                                'Delivery Performance (%)': pa.float64(),
+                                'Deliveries per Month': pa.int32(),
+                                'Distance (km)': pa.float64(),
+                            })
+                        )
+                        df = table.to_pandas()
+                        # load_from_csv_dataframe normalizes each record on
+                        # insert; no second normalization pass needed.
                         supplier_db.load_from_csv_dataframe(df)
-                        # normalize after loader
-                        supplier_db.database = {
-                            vid: normalize_supplier_record(rec) for vid, rec in supplier_db.database.items()
-                        }
-                        supplier_db.save_to_json('supplier_database.json')
                         st.success(f"Successfully imported {len(supplier_db.database)} suppliers!")
                         st.rerun()
                     except Exception as e:
@@ -379,39 +409,64 @@ def main():
             st.markdown("### Export Data")
             if len(supplier_db.database) > 0:
                 export_format = st.radio("Export format:", ["JSON", "CSV", "Excel"])
-                if export_format == "JSON" and st.button("Export as JSON"):
-                    data = {
-                        'database': supplier_db.database,
-                        'metadata': {
-                            'export_date': datetime.now().isoformat(),
-                            'total_suppliers': len(supplier_db.database)
-                        }
-                    }
-                    json_str = json.dumps(data, indent=2)
+
+                # Only the selected format is serialized; the pinned
+                # Streamlit's download_button takes bytes, not callables,
+                # so the build runs at render time for that one format.
+                def _build_json():
+                    # Serialize the database through pandas' C JSON writer on
+                    # the raw-record frame instead of walking nested Python
+                    # dicts; keys and fields stay import-compatible. Output
+                    # is compact (no indent), which also shrinks the file.
+                    inner = pd.DataFrame.from_dict(supplier_db.database, orient='index').to_json(orient='index')
+                    metadata = orjson.dumps({
+                        'export_date': datetime.now().isoformat(),
+                        'total_suppliers': len(supplier_db.database),
+                    }).decode()
+                    return f'{{"database":{inner},"metadata":{metadata}}}'
+
+                def _build_csv():
+                    # pyarrow's columnar CSV writer is much faster than
+                    # pandas to_csv on large tables.
+                    import pyarrow as pa
+                    import pyarrow.csv as pacsv
+                    table = pa.Table.from_pandas(supplier_db.to_dataframe(), preserve_index=False)
+                    buf = pa.BufferOutputStream()
+                    pacsv.write_csv(table, buf)
+                    return buf.getvalue().to_pybytes()
+
+                def _build_excel():
+                    from io import BytesIO
+                    output = BytesIO()
+                    # constant_memory streams rows out as they are written
+                    # instead of holding the whole workbook object graph,
+                    # which keeps large exports flat in memory.
+                    with pd.ExcelWriter(
+                        output,
+                        engine='xlsxwriter',
+                        engine_kwargs={'options': {'constant_memory': True}}
+                    ) as writer:
+                        supplier_db.to_dataframe().to_excel(writer, sheet_name='Suppliers', index=False)
+                    return output.getvalue()
+
+                if export_format == "JSON":
                     st.download_button(
                         label="Download JSON",
-                        data=json_str,
+                        data=_build_json(),
                         file_name="supplier_database.json",
                         mime="application/json"
                     )
-                elif export_format == "CSV" and st.button("Export as CSV"):
-                    df = supplier_db.to_dataframe()
-                    csv = df.to_csv(index=False)
+                elif export_format == "CSV":
                     st.download_button(
                         label="Download CSV",
-                        data=csv,
+                        data=_build_csv(),
                         file_name="supplier_database.csv",
                         mime="text/csv"
                     )
-                elif export_format == "Excel" and st.button("Export as Excel"):
-                    df = supplier_db.to_dataframe()
-                    from io import BytesIO
-                    output = BytesIO()
-                    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                        df.to_excel(writer, sheet_name='Suppliers', index=False)
+                elif export_format == "Excel":
                     st.download_button(
                         label="Download Excel",
-                        data=output.getvalue(),
+                        data=_build_excel(),
                         file_name="supplier_database.xlsx",
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                     )
@@ -438,25 +493,14 @@ def main():
             )
             if results:
                 st.success(f"Found {len(results)} matching suppliers")
-                rows = []
-                for idx, rec in enumerate(results, 1):
-                    s = normalize_supplier_record(rec)
-                    rows.append({
-                        'Index': idx,
-                        'Vendor ID': s.get('vendor_id', ''),
-                        'Vendor ZIP': s.get('vendor_zip', ''),
-                        'Vendor Name': s.get('vendor_name', ''),
-                        'Vendor Country': s.get('vendor_country', ''),
-                        'City of Manufacture': s.get('city_of_manufacture', ''),
-                        'Delivery Performance (%)': f"{s.get('delivery_performance', 0.0):.1f}",
-                        'Deliveries per Month': s.get('deliveries_per_month', 0),
-                        'KB/Bendix Plant': s.get('plant', ''),
-                        'Distance (km)': f"{s.get('distance', 0.0):.1f}",
-                        'KB/Bendix Country': s.get('country', '')
-                    })
-                st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+                st.dataframe(_records_to_display_df(results), use_container_width=True, hide_index=True)
             else:
                 st.warning("No suppliers found matching the criteria")
 
+    # Coalesced persistence: mutations only mark the database dirty; one
+    # write per rerun happens here instead of inline at every call site.
+    if supplier_db._dirty:
+        supplier_db.save_to_parquet('supplier_database.parquet')
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,11 +4,326 @@ import pandas as pd
 import numpy as np
 from utils.data_manager import DataManager
 from utils.packaging_database import PackagingDatabase
-import json
+import orjson
 from io import BytesIO
 
 st.set_page_config(page_title="Packaging Data Management", page_icon="📦", layout="wide")
 
+
+@st.cache_resource
+def _get_packaging_db() -> PackagingDatabase:
+    """One loaded PackagingDatabase shared across sessions.
+
+    Session-scoped instances meant every new session re-parsed the same
+    JSON file; the cached resource loads it once site-wide. The instance
+    carries its own lock for write paths.
+    """
+    db = PackagingDatabase()
+    db.load_from_pickle('packaging_database.pkl')
+    return db
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _category_df(version: int, category: str, _items: dict):
+    """Display table for one category dict, cached on the database version.
+
+    The version counter bumps on every mutation and stands in for a
+    content hash: unchanged data turns the per-rerun table build into a
+    cache lookup without hashing the dicts. Arrow is what st.dataframe
+    serializes to anyway, so building the pyarrow Table directly skips
+    the pandas round trip. The build is column-wise: one Python list per
+    field instead of a merged dict per row, so the only per-cell work is
+    a dict lookup. Categories with mixed-type columns (special packaging
+    stores free-text dimensions) fall back to an object-dtype frame,
+    which Streamlit stringifies on its own.
+    """
+    import pyarrow as pa
+    fields = dict.fromkeys(k for item in _items.values() for k in item)
+    arrays = {'Item': list(_items)}
+    for col in fields:
+        arrays[col] = [item.get(col) for item in _items.values()]
+    try:
+        return pa.table(arrays)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Reuse the column arrays: pd.DataFrame from a dict of lists is a
+        # single pass per column, unlike from_dict(orient='index') which
+        # builds and reindexes a Series per row.
+        return pd.DataFrame({col: arrays[col] for col in fields}, index=arrays['Item'])
+
+
+CATEGORY_PAGE_SIZE = 100
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _search(version: int, search_term: str, _db: PackagingDatabase) -> dict:
+    """Search results cached per (term, database version).
+
+    Repeating a search after unrelated reruns is a dict lookup instead of
+    a scan over the name index.
+    """
+    return _db.search_packaging(search_term)
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _export_json_bytes(version: int, _db: PackagingDatabase) -> bytes:
+    """Serialized export payload, rebuilt only when the database changes."""
+    data = {
+        'standard_boxes': _db.standard_boxes,
+        'special_packaging': _db.special_packaging,
+        'additional_packaging': _db.additional_packaging,
+        'accessory_packaging': _db.accessory_packaging,
+    }
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+# Above this size an uploaded database is parsed incrementally instead of
+# being materialized in one orjson.loads call.
+IMPORT_STREAM_THRESHOLD = 8 * 1024 * 1024
+
+
+def _parse_import(uploaded_file) -> dict:
+    """Parse an uploaded database JSON, streaming when the file is large.
+
+    Small exports go through orjson in one shot. Past the threshold ijson
+    walks each category map incrementally, so peak memory stays near the
+    size of one category instead of the whole decoded document.
+    """
+    raw = uploaded_file.getvalue()
+    if len(raw) < IMPORT_STREAM_THRESHOLD:
+        return orjson.loads(raw)
+    import ijson
+    data = {}
+    for key in ('standard_boxes', 'special_packaging',
+                'additional_packaging', 'accessory_packaging'):
+        uploaded_file.seek(0)
+        data[key] = dict(ijson.kvitems(uploaded_file, key))
+    return data
+
+
+def _show_category_table(version: int, category: str, items: dict, empty_msg: str):
+    """Render one category table, paginated past CATEGORY_PAGE_SIZE rows.
+
+    The full table is built once per database version and the visible
+    window is cut out of it afterwards — slicing the source dict before
+    construction would force a rebuild on every page turn, while slicing
+    the cached Arrow table is zero-copy.
+    """
+    if not items:
+        st.info(empty_msg)
+        return
+    table = _category_df(version, category, items)
+    if len(table) > CATEGORY_PAGE_SIZE:
+        col_page, col_size = st.columns(2)
+        size = col_size.selectbox(
+            "Rows per page", (50, CATEGORY_PAGE_SIZE, 250),
+            index=1, key=f"size_{category}",
+        )
+        total_pages = -(-len(table) // size)
+        page = col_page.number_input(
+            f"Page (of {total_pages})",
+            min_value=1, max_value=total_pages, value=1,
+            key=f"page_{category}",
+        )
+        start = (page - 1) * size
+        # pa.Table.slice is zero-copy; iloc covers the pandas fallback.
+        table = table.slice(start, size) if hasattr(table, 'slice') \
+            else table.iloc[start:start + size]
+    st.dataframe(table, use_container_width=True)
+
+
+@st.fragment
+def _view_database(packaging_db: PackagingDatabase):
+    """View Database tab; reruns in isolation as a fragment."""
+    st.subheader("Packaging Database")
+    
+    stats = packaging_db.get_statistics()
+    if stats['total_items'] > 0:
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Standard Boxes", stats['standard_boxes_count'])
+        col2.metric("Special Packaging", stats['special_packaging_count'])
+        col3.metric("Additional Packaging", stats['additional_packaging_count'])
+        col4.metric("Accessory Packaging", stats['accessory_packaging_count'])
+        
+        # st.tabs renders every tab body per rerun; a radio builds only
+        # the selected category's table, so one table is materialized per
+        # interaction regardless of how many categories exist.
+        categories = {
+            'Standard Boxes': (packaging_db.standard_boxes, "No standard boxes configured."),
+            'Special Packaging': (packaging_db.special_packaging, "No special packaging configured."),
+            'Additional Packaging': (packaging_db.additional_packaging, "No additional packaging configured."),
+            'Accessory Packaging': (packaging_db.accessory_packaging, "No accessory packaging configured."),
+        }
+        selected_category = st.radio(
+            "Category", list(categories), horizontal=True, key="view_category"
+        )
+        items, empty_msg = categories[selected_category]
+        _show_category_table(packaging_db._version, selected_category, items, empty_msg)
+    else:
+        st.warning("No packaging data loaded. Please import data or add new items.")
+
+
+# Field specs are (label, key, kind, column); kind picks the widget and
+# its numeric constraints. One schema per category replaces the four
+# near-identical hand-written form bodies in both Add and Edit.
+_DIMENSIONED_SCHEMA = [
+    ("Packaging Characteristics", "Packaging_Characteristics", "text", 0),
+    ("Cost per Piece (€)", "Cost_per_pcs", "float", 0),
+    ("Length (mm)", "L", "int", 0),
+    ("Width (mm)", "W", "int", 0),
+    ("Height (mm)", "H", "int", 0),
+    ("Weight (kg)", "MT_weight_kg", "float", 1),
+    ("Boxes per LU", "Pcs_Boxes_per_LU", "int", 1),
+    ("Boxes per Layer", "Boxes_per_layer", "int", 1),
+]
+
+SCHEMAS = {
+    "Standard Boxes": _DIMENSIONED_SCHEMA,
+    # Special packaging keeps free-text dimensions ("like KLT/pallet").
+    "Special Packaging": [
+        ("Packaging Characteristics", "Packaging_Characteristics", "text", 0),
+        ("Cost per Piece (€)", "Cost_per_pcs", "float", 0),
+        ("Length", "L", "text", 0),
+        ("Width", "W", "text", 0),
+        ("Height", "H", "text", 1),
+        ("Weight (kg)", "MT_weight_kg", "float", 1),
+        ("Boxes per LU", "Pcs_Boxes_per_LU", "text", 1),
+        ("Boxes per Layer", "Boxes_per_layer", "text", 1),
+    ],
+    "Additional Packaging": _DIMENSIONED_SCHEMA,
+    "Accessory Packaging": [
+        ("Number per PU", "No_per_PU", "int", 0),
+        ("Average Price (€)", "Ave_Price", "float", 0),
+        ("Average Weight (kg)", "Ave_Weight_kg", "float", 1),
+        ("Packaging Characteristics", "Packaging_Characteristics", "text", 1),
+    ],
+}
+
+_ADD_METHODS = {
+    "Standard Boxes": "add_standard_box",
+    "Special Packaging": "add_special_packaging",
+    "Additional Packaging": "add_additional_packaging",
+    "Accessory Packaging": "add_accessory_packaging",
+}
+_REMOVE_METHODS = {
+    "Standard Boxes": "remove_standard_box",
+    "Special Packaging": "remove_special_packaging",
+    "Additional Packaging": "remove_additional_packaging",
+    "Accessory Packaging": "remove_accessory_packaging",
+}
+_ITEM_LABELS = {
+    "Standard Boxes": "Standard box",
+    "Special Packaging": "Special packaging",
+    "Additional Packaging": "Additional packaging",
+    "Accessory Packaging": "Accessory packaging",
+}
+
+
+def _render_form(schema, initial=None):
+    """Render one schema-driven form body; returns the item dict.
+
+    Must be called inside st.form. Add forms pass no initial and start
+    from widget defaults; Edit forms seed each widget from the stored
+    item.
+    """
+    initial = initial or {}
+    cols = st.columns(2)
+    values = {}
+    for label, key, kind, col in schema:
+        target = cols[col]
+        if kind == "int":
+            values[key] = target.number_input(label, value=initial.get(key, 0), min_value=0, step=1)
+        elif kind == "float":
+            values[key] = target.number_input(label, value=initial.get(key, 0.0), min_value=0.0, step=0.01)
+        else:
+            seed = initial.get(key, "")
+            values[key] = target.text_input(label, value="" if seed is None else str(seed))
+    return values
+
+
+@st.fragment
+def _manage_items(packaging_db: PackagingDatabase):
+    """Add/Edit/Delete tab as a fragment.
+
+    Widget interactions (pickers, typing) rerun only this fragment. A
+    successful mutation still issues a full st.rerun after saving: the
+    item lists here and the View tab were rendered before the mutation
+    executed, so without it they would keep showing pre-mutation state.
+    """
+    st.subheader("Add, Edit, or Delete Packaging Item")
+    
+    # Action selector
+    action = st.radio("Select Action", ["Add New Item", "Edit Existing Item", "Delete Item"], horizontal=True)
+    
+    packaging_type = st.selectbox(
+        "Packaging Type",
+        ["Standard Boxes", "Special Packaging", "Additional Packaging", "Accessory Packaging"]
+    )
+    
+    if action == "Add New Item":
+        item_name = st.text_input("Item Name *", help="Name of the packaging item", key="add_item_name")
+        
+        with st.form("add_item_form"):
+            item_data = _render_form(SCHEMAS[packaging_type])
+            submitted = st.form_submit_button("Add Item", type="primary")
+            
+            if submitted and item_name:
+                getattr(packaging_db, _ADD_METHODS[packaging_type])(item_name, item_data)
+                packaging_db.save_to_pickle('packaging_database.pkl')
+                st.success(f"{_ITEM_LABELS[packaging_type]} '{item_name}' added successfully!")
+                st.rerun()
+    
+    elif action == "Edit Existing Item":
+        # Get existing items for selected packaging type
+        existing_items = packaging_db.item_names(packaging_type)
+        
+        if not existing_items:
+            st.warning(f"No {packaging_type} items to edit.")
+        else:
+            selected_item = st.selectbox("Select Item to Edit", existing_items, key="edit_item_select")
+            
+            # Get current item data
+            item_data = packaging_db.get_packaging_details(packaging_type, selected_item)
+            
+            with st.form("edit_item_form"):
+                st.markdown(f"### Editing: {selected_item}")
+                updated_data = _render_form(SCHEMAS[packaging_type], initial=item_data)
+                submitted = st.form_submit_button("Update Item", type="primary")
+                
+                if submitted:
+                    getattr(packaging_db, _ADD_METHODS[packaging_type])(selected_item, updated_data)
+                    packaging_db.save_to_pickle('packaging_database.pkl')
+                    st.success(f"{_ITEM_LABELS[packaging_type]} '{selected_item}' updated successfully!")
+                    st.rerun()
+    
+    else:  # Delete Item
+        # Get existing items for selected packaging type
+        existing_items = packaging_db.item_names(packaging_type)
+        
+        if not existing_items:
+            st.warning(f"No {packaging_type} items to delete.")
+        else:
+            selected_item = st.selectbox("Select Item to Delete", existing_items, key="delete_item_select")
+            
+            st.warning(f"⚠️ You are about to delete: **{selected_item}**")
+            st.info("This action cannot be undone. Make sure you have a backup if needed.")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("🗑️ Confirm Delete", type="secondary", use_container_width=True):
+                    getattr(packaging_db, _REMOVE_METHODS[packaging_type])(selected_item)
+                    packaging_db.save_to_pickle('packaging_database.pkl')
+                    st.success(f"Item '{selected_item}' deleted successfully!")
+                    st.rerun()
+            
+            with col2:
+                if st.button("Cancel", use_container_width=True):
+                    st.rerun()
+
+    # Safety net for any mutation path that did not rerun (fragment
+    # reruns skip the tail of main()).
+    if packaging_db._dirty:
+        packaging_db.save_to_pickle('packaging_database.pkl')
+
+
 def main():
     st.title("Packaging Data Management")
     st.markdown("Manage Packaging Database")
@@ -18,402 +333,18 @@ def main():
     if 'data_manager' not in st.session_state:
         st.session_state.data_manager = DataManager()
     
-    if 'packaging_db' not in st.session_state:
-        st.session_state.packaging_db = PackagingDatabase()
-        try:
-            st.session_state.packaging_db.load_from_json('packaging_database.json')
-        except:
-            pass
-    
-    packaging_db = st.session_state.packaging_db
+    packaging_db = _get_packaging_db()
     
     # Create tabs
     tab1, tab2, tab3, tab4 = st.tabs(["📊 View Database", "➕ Add/Edit/Delete Item", "📁 Import/Export", "🔍 Search & Filter"])
     
     # Tab 1: View Database
     with tab1:
-        st.subheader("Packaging Database")
-        
-        stats = packaging_db.get_statistics()
-        if stats['total_items'] > 0:
-            col1, col2, col3, col4 = st.columns(4)
-            col1.metric("Standard Boxes", stats['standard_boxes_count'])
-            col2.metric("Special Packaging", stats['special_packaging_count'])
-            col3.metric("Additional Packaging", stats['additional_packaging_count'])
-            col4.metric("Accessory Packaging", stats['accessory_packaging_count'])
-            
-            data_tabs = st.tabs(["Standard Boxes", "Special Packaging", "Additional Packaging", "Accessory Packaging"])
-            
-            with data_tabs[0]:
-                if packaging_db.standard_boxes:
-                    df_standard = pd.DataFrame.from_dict(packaging_db.standard_boxes, orient='index')
-                    st.dataframe(df_standard, use_container_width=True)
-                else:
-                    st.info("No standard boxes configured.")
-            
-            with data_tabs[1]:
-                if packaging_db.special_packaging:
-                    df_special = pd.DataFrame.from_dict(packaging_db.special_packaging, orient='index')
-                    st.dataframe(df_special, use_container_width=True)
-                else:
-                    st.info("No special packaging configured.")
-            
-            with data_tabs[2]:
-                if packaging_db.additional_packaging:
-                    df_additional = pd.DataFrame.from_dict(packaging_db.additional_packaging, orient='index')
-                    st.dataframe(df_additional, use_container_width=True)
-                else:
-                    st.info("No additional packaging configured.")
-                    
-            with data_tabs[3]:
-                if packaging_db.accessory_packaging:
-                    df_accessory = pd.DataFrame.from_dict(packaging_db.accessory_packaging, orient='index')
-                    st.dataframe(df_accessory, use_container_width=True)
-                else:
-                    st.info("No accessory packaging configured.")
-        else:
-            st.warning("No packaging data loaded. Please import data or add new items.")
+        _view_database(packaging_db)
     
     # Tab 2: Add/Edit/Delete Item
     with tab2:
-        st.subheader("Add, Edit, or Delete Packaging Item")
-        
-        # Action selector
-        action = st.radio("Select Action", ["Add New Item", "Edit Existing Item", "Delete Item"], horizontal=True)
-        
-        packaging_type = st.selectbox(
-            "Packaging Type",
-            ["Standard Boxes", "Special Packaging", "Additional Packaging", "Accessory Packaging"]
-        )
-        
-        if action == "Add New Item":
-            item_name = st.text_input("Item Name *", help="Name of the packaging item", key="add_item_name")
-            
-            if packaging_type == "Standard Boxes":
-                with st.form("add_standard_box_form"):
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        characteristics = st.text_input("Packaging Characteristics", value="")
-                        cost_per_pcs = st.number_input("Cost per Piece (€)", min_value=0.0, step=0.01)
-                        length = st.number_input("Length (mm)", min_value=0, step=1)
-                        width = st.number_input("Width (mm)", min_value=0, step=1)
-                        height = st.number_input("Height (mm)", min_value=0, step=1)
-                    
-                    with col2:
-                        weight_kg = st.number_input("Weight (kg)", min_value=0.0, step=0.01)
-                        boxes_per_lu = st.number_input("Boxes per LU", min_value=0, step=1)
-                        boxes_per_layer = st.number_input("Boxes per Layer", min_value=0, step=1)
-                    
-                    submitted = st.form_submit_button("Add Item", type="primary")
-                    
-                    if submitted and item_name:
-                        item_data = {
-                            "Packaging_Characteristics": characteristics,
-                            "Cost_per_pcs": cost_per_pcs,
-                            "L": length,
-                            "W": width,
-                            "H": height,
-                            "MT_weight_kg": weight_kg,
-                            "Pcs_Boxes_per_LU": boxes_per_lu,
-                            "Boxes_per_layer": boxes_per_layer
-                        }
-                        
-                        packaging_db.add_standard_box(item_name, item_data)
-                        packaging_db.save_to_json('packaging_database.json')
-                        st.success(f"Standard box '{item_name}' added successfully!")
-                        st.rerun()
-            
-            elif packaging_type == "Special Packaging":
-                with st.form("add_special_packaging_form"):
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        characteristics = st.text_input("Packaging Characteristics", value="")
-                        cost_per_pcs = st.number_input("Cost per Piece (€)", min_value=0.0, step=0.01)
-                        length = st.text_input("Length", value="")
-                        width = st.text_input("Width", value="")
-                    
-                    with col2:
-                        height = st.text_input("Height", value="")
-                        weight_kg = st.number_input("Weight (kg)", min_value=0.0, step=0.01)
-                        boxes_per_lu = st.text_input("Boxes per LU", value="")
-                        boxes_per_layer = st.text_input("Boxes per Layer", value="")
-                    
-                    submitted = st.form_submit_button("Add Item", type="primary")
-                    
-                    if submitted and item_name:
-                        item_data = {
-                            "Packaging_Characteristics": characteristics,
-                            "Cost_per_pcs": cost_per_pcs,
-                            "L": length,
-                            "W": width,
-                            "H": height,
-                            "MT_weight_kg": weight_kg,
-                            "Pcs_Boxes_per_LU": boxes_per_lu,
-                            "Boxes_per_layer": boxes_per_layer
-                        }
-                        
-                        packaging_db.add_special_packaging(item_name, item_data)
-                        packaging_db.save_to_json('packaging_database.json')
-                        st.success(f"Special packaging '{item_name}' added successfully!")
-                        st.rerun()
-            
-            elif packaging_type == "Additional Packaging":
-                with st.form("add_additional_packaging_form"):
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        characteristics = st.text_input("Packaging Characteristics", value="")
-                        cost_per_pcs = st.number_input("Cost per Piece (€)", min_value=0.0, step=0.01)
-                        length = st.number_input("Length (mm)", min_value=0, step=1)
-                        width = st.number_input("Width (mm)", min_value=0, step=1)
-                    
-                    with col2:
-                        height = st.number_input("Height (mm)", min_value=0, step=1)
-                        weight_kg = st.number_input("Weight (kg)", min_value=0.0, step=0.01)
-                        boxes_per_lu = st.number_input("Boxes per LU", min_value=0, step=1)
-                        boxes_per_layer = st.number_input("Boxes per Layer", min_value=0, step=1)
-                    
-                    submitted = st.form_submit_button("Add Item", type="primary")
-                    
-                    if submitted and item_name:
-                        item_data = {
-                            "Packaging_Characteristics": characteristics,
-                            "Cost_per_pcs": cost_per_pcs,
-                            "L": length,
-                            "W": width,
-                            "H": height,
-                            "MT_weight_kg": weight_kg,
-                            "Pcs_Boxes_per_LU": boxes_per_lu,
-                            "Boxes_per_layer": boxes_per_layer
-                        }
-                        
-                        packaging_db.add_additional_packaging(item_name, item_data)
-                        packaging_db.save_to_json('packaging_database.json')
-                        st.success(f"Additional packaging '{item_name}' added successfully!")
-                        st.rerun()
-            
-            else:  # Accessory Packaging
-                with st.form("add_accessory_packaging_form"):
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        no_per_pu = st.number_input("Number per PU", min_value=0, step=1)
-                        ave_price = st.number_input("Average Price (€)", min_value=0.0, step=0.01)
-                    
-                    with col2:
-                        ave_weight_kg = st.number_input("Average Weight (kg)", min_value=0.0, step=0.01)
-                        characteristics = st.text_input("Packaging Characteristics", value="")
-                    
-                    submitted = st.form_submit_button("Add Item", type="primary")
-                    
-                    if submitted and item_name:
-                        item_data = {
-                            "No_per_PU": no_per_pu,
-                            "Ave_Price": ave_price,
-                            "Ave_Weight_kg": ave_weight_kg,
-                            "Packaging_Characteristics": characteristics
-                        }
-                        
-                        packaging_db.add_accessory_packaging(item_name, item_data)
-                        packaging_db.save_to_json('packaging_database.json')
-                        st.success(f"Accessory packaging '{item_name}' added successfully!")
-                        st.rerun()
-        
-        elif action == "Edit Existing Item":
-            # Get existing items for selected packaging type
-            if packaging_type == "Standard Boxes":
-                existing_items = list(packaging_db.standard_boxes.keys())
-            elif packaging_type == "Special Packaging":
-                existing_items = list(packaging_db.special_packaging.keys())
-            elif packaging_type == "Additional Packaging":
-                existing_items = list(packaging_db.additional_packaging.keys())
-            else:
-                existing_items = list(packaging_db.accessory_packaging.keys())
-            
-            if not existing_items:
-                st.warning(f"No {packaging_type} items to edit.")
-            else:
-                selected_item = st.selectbox("Select Item to Edit", existing_items, key="edit_item_select")
-                
-                # Get current item data
-                item_data = packaging_db.get_packaging_details(packaging_type, selected_item)
-                
-                if packaging_type == "Standard Boxes":
-                    with st.form("edit_standard_box_form"):
-                        st.markdown(f"### Editing: {selected_item}")
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            characteristics = st.text_input("Packaging Characteristics", value=item_data.get("Packaging_Characteristics", ""))
-                            cost_per_pcs = st.number_input("Cost per Piece (€)", value=float(item_data.get("Cost_per_pcs", 0)), min_value=0.0, step=0.01)
-                            length = st.number_input("Length (mm)", value=int(item_data.get("L", 0)), min_value=0, step=1)
-                            width = st.number_input("Width (mm)", value=int(item_data.get("W", 0)), min_value=0, step=1)
-                            height = st.number_input("Height (mm)", value=int(item_data.get("H", 0)), min_value=0, step=1)
-                        
-                        with col2:
-                            weight_kg = st.number_input("Weight (kg)", value=float(item_data.get("MT_weight_kg", 0)), min_value=0.0, step=0.01)
-                            boxes_per_lu = st.number_input("Boxes per LU", value=int(item_data.get("Pcs_Boxes_per_LU", 0)), min_value=0, step=1)
-                            boxes_per_layer = st.number_input("Boxes per Layer", value=int(item_data.get("Boxes_per_layer", 0)), min_value=0, step=1)
-                        
-                        submitted = st.form_submit_button("Update Item", type="primary")
-                        
-                        if submitted:
-                            updated_data = {
-                                "Packaging_Characteristics": characteristics,
-                                "Cost_per_pcs": cost_per_pcs,
-                                "L": length,
-                                "W": width,
-                                "H": height,
-                                "MT_weight_kg": weight_kg,
-                                "Pcs_Boxes_per_LU": boxes_per_lu,
-                                "Boxes_per_layer": boxes_per_layer
-                            }
-                            
-                            packaging_db.add_standard_box(selected_item, updated_data)
-                            packaging_db.save_to_json('packaging_database.json')
-                            st.success(f"Standard box '{selected_item}' updated successfully!")
-                            st.rerun()
-                
-                elif packaging_type == "Special Packaging":
-                    with st.form("edit_special_packaging_form"):
-                        st.markdown(f"### Editing: {selected_item}")
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            characteristics = st.text_input("Packaging Characteristics", value=item_data.get("Packaging_Characteristics", ""))
-                            cost_per_pcs = st.number_input("Cost per Piece (€)", value=float(item_data.get("Cost_per_pcs", 0)), min_value=0.0, step=0.01)
-                            length = st.text_input("Length", value=str(item_data.get("L", "")))
-                            width = st.text_input("Width", value=str(item_data.get("W", "")))
-                        
-                        with col2:
-                            height = st.text_input("Height", value=str(item_data.get("H", "")))
-                            weight_kg = st.number_input("Weight (kg)", value=float(item_data.get("MT_weight_kg", 0)), min_value=0.0, step=0.01)
-                            boxes_per_lu = st.text_input("Boxes per LU", value=str(item_data.get("Pcs_Boxes_per_LU", "")))
-                            boxes_per_layer = st.text_input("Boxes per Layer", value=str(item_data.get("Boxes_per_layer", "")))
-                        
-                        submitted = st.form_submit_button("Update Item", type="primary")
-                        
-                        if submitted:
-                            updated_data = {
-                                "Packaging_Characteristics": characteristics,
-                                "Cost_per_pcs": cost_per_pcs,
-                                "L": length,
-                                "W": width,
-                                "H": height,
-                                "MT_weight_kg": weight_kg,
-                                "Pcs_Boxes_per_LU": boxes_per_lu,
-                                "Boxes_per_layer": boxes_per_layer
-                            }
-                            
-                            packaging_db.add_special_packaging(selected_item, updated_data)
-                            packaging_db.save_to_json('packaging_database.json')
-                            st.success(f"Special packaging '{selected_item}' updated successfully!")
-                            st.rerun()
-                
-                elif packaging_type == "Additional Packaging":
-                    with st.form("edit_additional_packaging_form"):
-                        st.markdown(f"### Editing: {selected_item}")
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            characteristics = st.text_input("Packaging Characteristics", value=item_data.get("Packaging_Characteristics", ""))
-                            cost_per_pcs = st.number_input("Cost per Piece (€)", value=float(item_data.get("Cost_per_pcs", 0)), min_value=0.0, step=0.01)
-                            length = st.number_input("Length (mm)", value=int(item_data.get("L", 0)), min_value=0, step=1)
-                            width = st.number_input("Width (mm)", value=int(item_data.get("W", 0)), min_value=0, step=1)
-                        
-                        with col2:
-                            height = st.number_input("Height (mm)", value=int(item_data.get("H", 0)), min_value=0, step=1)
-                            weight_kg = st.number_input("Weight (kg)", value=float(item_data.get("MT_weight_kg", 0)), min_value=0.0, step=0.01)
-                            boxes_per_lu = st.number_input("Boxes per LU", value=int(item_data.get("Pcs_Boxes_per_LU", 0)), min_value=0, step=1)
-                            boxes_per_layer = st.number_input("Boxes per Layer", value=int(item_data.get("Boxes_per_layer", 0)), min_value=0, step=1)
-                        
-                        submitted = st.form_submit_button("Update Item", type="primary")
-                        
-                        if submitted:
-                            updated_data = {
-                                "Packaging_Characteristics": characteristics,
-                                "Cost_per_pcs": cost_per_pcs,
-                                "L": length,
-                                "W": width,
-                                "H": height,
-                                "MT_weight_kg": weight_kg,
-                                "Pcs_Boxes_per_LU": boxes_per_lu,
-                                "Boxes_per_layer": boxes_per_layer
-                            }
-                            
-                            packaging_db.add_additional_packaging(selected_item, updated_data)
-                            packaging_db.save_to_json('packaging_database.json')
-                            st.success(f"Additional packaging '{selected_item}' updated successfully!")
-                            st.rerun()
-                
-                else:  # Accessory Packaging
-                    with st.form("edit_accessory_packaging_form"):
-                        st.markdown(f"### Editing: {selected_item}")
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            no_per_pu = st.number_input("Number per PU", value=int(item_data.get("No_per_PU", 0)), min_value=0, step=1)
-                            ave_price = st.number_input("Average Price (€)", value=float(item_data.get("Ave_Price", 0)), min_value=0.0, step=0.01)
-                        
-                        with col2:
-                            ave_weight_kg = st.number_input("Average Weight (kg)", value=float(item_data.get("Ave_Weight_kg", 0)), min_value=0.0, step=0.01)
-                            characteristics = st.text_input("Packaging Characteristics", value=item_data.get("Packaging_Characteristics", ""))
-                        
-                        submitted = st.form_submit_button("Update Item", type="primary")
-                        
-                        if submitted:
-                            updated_data = {
-                                "No_per_PU": no_per_pu,
-                                "Ave_Price": ave_price,
-                                "Ave_Weight_kg": ave_weight_kg,
-                                "Packaging_Characteristics": characteristics
-                            }
-                            
-                            packaging_db.add_accessory_packaging(selected_item, updated_data)
-                            packaging_db.save_to_json('packaging_database.json')
-                            st.success(f"Accessory packaging '{selected_item}' updated successfully!")
-                            st.rerun()
-        
-        else:  # Delete Item
-            # Get existing items for selected packaging type
-            if packaging_type == "Standard Boxes":
-                existing_items = list(packaging_db.standard_boxes.keys())
-            elif packaging_type == "Special Packaging":
-                existing_items = list(packaging_db.special_packaging.keys())
-            elif packaging_type == "Additional Packaging":
-                existing_items = list(packaging_db.additional_packaging.keys())
-            else:
-                existing_items = list(packaging_db.accessory_packaging.keys())
-            
-            if not existing_items:
-                st.warning(f"No {packaging_type} items to delete.")
-            else:
-                selected_item = st.selectbox("Select Item to Delete", existing_items, key="delete_item_select")
-                
-                st.warning(f"⚠️ You are about to delete: **{selected_item}**")
-                st.info("This action cannot be undone. Make sure you have a backup if needed.")
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button("🗑️ Confirm Delete", type="secondary", use_container_width=True):
-                        if packaging_type == "Standard Boxes":
-                            packaging_db.remove_standard_box(selected_item)
-                        elif packaging_type == "Special Packaging":
-                            packaging_db.remove_special_packaging(selected_item)
-                        elif packaging_type == "Additional Packaging":
-                            packaging_db.remove_additional_packaging(selected_item)
-                        else:
-                            packaging_db.remove_accessory_packaging(selected_item)
-                        
-                        packaging_db.save_to_json('packaging_database.json')
-                        st.success(f"Item '{selected_item}' deleted successfully!")
-                        st.rerun()
-                
-                with col2:
-                    if st.button("Cancel", use_container_width=True):
-                        st.rerun()
+        _manage_items(packaging_db)
     
     # Tab 3: Import/Export
     with tab3:
@@ -428,12 +359,17 @@ def main():
             if uploaded_file is not None:
                 if st.button("Import JSON Data"):
                     try:
-                        data = json.load(uploaded_file)
-                        packaging_db.standard_boxes = data.get('standard_boxes', {})
-                        packaging_db.special_packaging = data.get('special_packaging', {})
-                        packaging_db.additional_packaging = data.get('additional_packaging', {})
-                        packaging_db.accessory_packaging = data.get('accessory_packaging', {})
-                        packaging_db.save_to_json('packaging_database.json')
+                        data = _parse_import(uploaded_file)
+                        with packaging_db.transaction():
+                            packaging_db.standard_boxes = data.get('standard_boxes', {})
+                            packaging_db.special_packaging = data.get('special_packaging', {})
+                            packaging_db.additional_packaging = data.get('additional_packaging', {})
+                            packaging_db.accessory_packaging = data.get('accessory_packaging', {})
+                            # Bulk assignment bypasses the mutators, so bump the
+                            # version by hand to invalidate the cached frames.
+                            packaging_db.coerce_types()
+                            packaging_db._version += 1
+                            packaging_db._dirty = True
                         
                         st.success("Successfully imported packaging data!")
                         st.rerun()
@@ -441,28 +377,22 @@ def main():
                         st.error(f"Error importing JSON: {str(e)}")
             
             if st.button("Reset to Defaults"):
-                packaging_db.reset_to_defaults()
-                packaging_db.save_to_json('packaging_database.json')
+                with packaging_db.transaction():
+                    packaging_db.reset_to_defaults()
                 st.success("Reset to default packaging data!")
                 st.rerun()
         
         with col2:
             st.markdown("### Export Data")
             
-            if st.button("Export as JSON"):
-                data = {
-                    'standard_boxes': packaging_db.standard_boxes,
-                    'special_packaging': packaging_db.special_packaging,
-                    'additional_packaging': packaging_db.additional_packaging,
-                    'accessory_packaging': packaging_db.accessory_packaging
-                }
-                json_str = json.dumps(data, indent=2)
-                st.download_button(
-                    label="Download JSON",
-                    data=json_str,
-                    file_name="packaging_database.json",
-                    mime="application/json"
-                )
+            # Serialization is memoized on the database version, so reruns
+            # between edits reuse the same payload bytes.
+            st.download_button(
+                label="Export as JSON",
+                data=_export_json_bytes(packaging_db._version, packaging_db),
+                file_name="packaging_database.json",
+                mime="application/json"
+            )
     
     # Tab 4: Search & Filter
     with tab4:
@@ -471,18 +401,25 @@ def main():
         search_term = st.text_input("Search by name")
         
         if st.button("Search") and search_term:
-            results = packaging_db.search_packaging(search_term)
+            results = _search(packaging_db._version, search_term, packaging_db)
             
             found_any = False
             for category, items in results.items():
                 if items:
                     found_any = True
                     st.markdown(f"### {category}")
-                    df_results = pd.DataFrame.from_dict(items, orient='index')
+                    df_results = _category_df(packaging_db._version, f'search:{category}:{search_term}', items)
                     st.dataframe(df_results, use_container_width=True)
             
             if not found_any:
                 st.warning("No items found matching the search criteria")
 
+    # Coalesced persistence: the CRUD paths only mark the database dirty,
+    # and the page writes the JSON once per rerun. The flag lives on the
+    # session instance, so edits that trigger st.rerun are saved on the
+    # rerun that follows.
+    if packaging_db._dirty:
+        packaging_db.save_to_pickle('packaging_database.pkl')
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
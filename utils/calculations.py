@@ -6,9 +6,23 @@ This module contains the core calculation logic for computing logistics costs
 based on material, supplier, packaging, transport, and warehouse parameters.
 """
 import math
+import os
+from concurrent.futures import ProcessPoolExecutor
 from .packaging_tables import STANDARD_BOXES, SPECIAL_PACKAGING, ADDITIONAL_PACKAGING, ACCESSORY_PACKAGING
 from .repacking_table import PACKAGING_OPERATION_COSTS
 
+
+def _batch_worker(args):
+    """Top-level worker for process-pool batch calculation.
+
+    Builds its own calculator (instances are not shared across processes)
+    and returns both the result rows and any collected errors.
+    """
+    pairs, kwargs = args
+    calc = LogisticsCostCalculator()
+    results = calc._calculate_batch_serial(pairs, kwargs)
+    return results, calc.calculation_errors
+
 class LogisticsCostCalculator:
     """
     Main calculator class for logistics cost computations.
@@ -904,14 +918,21 @@ class LogisticsCostCalculator:
         co2_config=None,
         additional_costs=None,
         operations_config=None,
-        inventory_config=None
+        inventory_config=None,
+        precomp=None
     ):
         """
         Calculate total logistics cost per piece for a material-supplier combination.
+
+        precomp optionally carries the config-only scalars from
+        precompute_config so batch callers do not rederive them per pair.
         """
         try:
+            pc = precomp if precomp is not None else self.precompute_config(
+                packaging_config, repacking_config, operations_config
+            )
             packaging_cost = self.packaging_cost_per_piece(material, packaging_config, operations_config)
-            repacking_cost = self.get_repacking_cost_value(repacking_config)
+            repacking_cost = pc['repacking_cost']
             customs_cost = self.customs_cost_per_piece(
                 material, duty_rate_percent, transport_config, packaging_config, operations_config
             )
@@ -934,7 +955,7 @@ class LogisticsCostCalculator:
             if transport_config.get('mode1') == 'Sea':
                 fill_qty_used = packaging_config.get('fill_qty_lu_oversea', 1) or 1
             else:
-                fill_qty_used = self.filling_qty_pcs_per_lu(packaging_config) or 1
+                fill_qty_used = pc['fill_qty_pcs_per_lu'] or 1
             transport_cost_lu = transport_cost * fill_qty_used
             # --------------------------------------------------------------
 
@@ -955,23 +976,23 @@ class LogisticsCostCalculator:
             plant_cost = self.packaging_cost_plant(material, packaging_config)
             packaging_cost_total = self.packaging_cost_total(material, packaging_config, operations_config)
             scrap_wood = self.empties_scrapping_wood(material, packaging_config)
-            p_weight = self.packaging_weight(packaging_config)
-            boxes_per_lu = self.no_boxes_per_lu(packaging_config)
-            pallet_weight = self.weight_pallet(packaging_config)
-            fill_qty_lu = self.filling_qty_pcs_per_lu(packaging_config)
-            sp_fill_qty_pcs_lu = self.SP_Filling_Qty_Pcs_lu(packaging_config)
-            b_price = self.price_per_box(packaging_config)
-            sp_weight = self.sp_packaging_weight(packaging_config)
-            price_tray = self.price_per_tray(packaging_config)
-            sp_pallet_price = self.price_sp_pallets(packaging_config)
-            price_cover = self.price_sp_cover(packaging_config)
-            sp_pallet_weight = self.sp_pallet_weight(packaging_config)
-            pallet_price = self.pallet_price(packaging_config)
+            p_weight = pc['packaging_weight']
+            boxes_per_lu = pc['boxes_per_lu']
+            pallet_weight = pc['pallet_weight']
+            fill_qty_lu = pc['fill_qty_pcs_per_lu']
+            sp_fill_qty_pcs_lu = pc['sp_fill_qty_pcs_lu']
+            b_price = pc['price_per_box']
+            sp_weight = pc['sp_packaging_weight']
+            price_tray = pc['price_per_tray']
+            sp_pallet_price = pc['sp_pallet_price']
+            price_cover = pc['price_sp_cover']
+            sp_pallet_weight = pc['sp_pallet_weight']
+            pallet_price = pc['pallet_price']
 
             daily_demand = material.get('daily_demand', 0)
-            loop_plant_days = self.packaging_loop_days(packaging_config)
+            loop_plant_days = pc['loop_plant_days']
             fill_qty_box = max(packaging_config.get('fill_qty_box', 1), 1)
-            b_per_lu = self.no_boxes_per_lu(packaging_config)
+            b_per_lu = pc['boxes_per_lu']
             no_box_loop_plant = math.ceil(((daily_demand * loop_plant_days) / fill_qty_box if fill_qty_box > 0 else 0) / 10) * 10
             no_lu_loop_plant = math.ceil(no_box_loop_plant / b_per_lu if b_per_lu > 0 else 0)
 
@@ -979,7 +1000,7 @@ class LogisticsCostCalculator:
             no_box_coc = (daily_demand * subsupplier_days) / fill_qty_box if fill_qty_box > 0 else 0
             no_lu_coc = no_box_coc / b_per_lu if b_per_lu > 0 else 0
             fill_tray = max(packaging_config.get('fill_qty_tray', 1), 1)
-            total_pck_loop_days = max(self.total_packaging_loop(packaging_config, operations_config), 1)
+            total_pck_loop_days = max(pc['total_packaging_loop'], 1)
             trays_per_sp_pal = max(packaging_config.get('trays_per_sp_pal', 1), 1)
             sp_needed = packaging_config.get('sp_needed', 'No')
             add_sp_pack = packaging_config.get('add_sp_pack', 'No')
@@ -1015,6 +1036,11 @@ class LogisticsCostCalculator:
                 # Supplier
                 'supplier_id': supplier.get('vendor_id'),
                 'supplier_name': supplier.get('vendor_name'),
+                # Pre-joined label so display code does not re-assemble it
+                # per row per section.
+                'supplier_label': (
+                    f"{supplier.get('vendor_id', '')} - {supplier.get('vendor_name', '')}"
+                ),
                 'Vendor Country': supplier.get('vendor_country'),
                 'City of Manufacture': supplier.get('city_of_manufacture'),
                 'Vendor ZIP': supplier.get('vendor_zip'),
@@ -1114,6 +1140,126 @@ class LogisticsCostCalculator:
             )
             return None
 
+    def precompute_config(self, packaging_config, repacking_config, operations_config):
+        """Derive the scalars that depend only on the shared configs.
+
+        These feed every row of a batch, so computing them once here and
+        threading the dict through calculate_total_logistics_cost keeps
+        the per-pair loop down to the material/supplier-dependent math.
+        """
+        return {
+            'repacking_cost': self.get_repacking_cost_value(repacking_config),
+            'fill_qty_pcs_per_lu': self.filling_qty_pcs_per_lu(packaging_config),
+            'packaging_weight': self.packaging_weight(packaging_config),
+            'boxes_per_lu': self.no_boxes_per_lu(packaging_config),
+            'pallet_weight': self.weight_pallet(packaging_config),
+            'sp_fill_qty_pcs_lu': self.SP_Filling_Qty_Pcs_lu(packaging_config),
+            'price_per_box': self.price_per_box(packaging_config),
+            'sp_packaging_weight': self.sp_packaging_weight(packaging_config),
+            'price_per_tray': self.price_per_tray(packaging_config),
+            'sp_pallet_price': self.price_sp_pallets(packaging_config),
+            'price_sp_cover': self.price_sp_cover(packaging_config),
+            'sp_pallet_weight': self.sp_pallet_weight(packaging_config),
+            'pallet_price': self.pallet_price(packaging_config),
+            'loop_plant_days': self.packaging_loop_days(packaging_config),
+            'total_packaging_loop': self.total_packaging_loop(packaging_config, operations_config),
+        }
+
+    def calculate_batch(
+        self,
+        pairs,
+        packaging_config,
+        transport_config,
+        warehouse_config,
+        repacking_config,
+        duty_rate_percent=0,
+        co2_config=None,
+        additional_costs=None,
+        operations_config=None,
+        inventory_config=None,
+    ):
+        """
+        Calculate logistics costs for many material-supplier pairs sharing
+        one configuration set.
+
+        The per-pair arithmetic is scalar and heavily branchy (packaging
+        special cases, transport modes, incoterm handling), so each row is
+        still produced by calculate_total_logistics_cost rather than by
+        rewriting the formulas as ndarray math. Centralizing the loop here
+        gives one place to hoist configuration-level work out of the
+        per-pair path. Pairs that fail are skipped; their errors land in
+        calculation_errors.
+
+        Large batches are fanned out over worker processes: the per-pair
+        math is pure-Python scalar arithmetic, so threads would serialize
+        on the GIL while processes parallelize for real. Small batches
+        stay serial to avoid pool start-up costs.
+        """
+        pairs = list(pairs)
+        kwargs = dict(
+            packaging_config=packaging_config,
+            transport_config=transport_config,
+            warehouse_config=warehouse_config,
+            repacking_config=repacking_config,
+            duty_rate_percent=duty_rate_percent,
+            co2_config=co2_config,
+            additional_costs=additional_costs,
+            operations_config=operations_config,
+            inventory_config=inventory_config,
+        )
+        if len(pairs) >= self.PARALLEL_THRESHOLD:
+            return self._calculate_batch_parallel(pairs, kwargs)
+        return self._calculate_batch_serial(pairs, kwargs)
+
+    # Below this many pairs, process start-up costs outweigh the win.
+    PARALLEL_THRESHOLD = 64
+
+    def _calculate_batch_serial(self, pairs, kwargs):
+        """Serial batch loop; also the unit of work for the process pool."""
+        precomp = self.precompute_config(
+            kwargs['packaging_config'],
+            kwargs['repacking_config'],
+            kwargs['operations_config'],
+        )
+        results = []
+        for pair in pairs:
+            result = self.calculate_total_logistics_cost(
+                material=pair['material'],
+                supplier=pair['supplier'],
+                precomp=precomp,
+                **kwargs,
+            )
+            if result:
+                results.append(result)
+        return results
+
+    def _calculate_batch_parallel(self, pairs, kwargs):
+        """Split the batch across worker processes and merge the results.
+
+        Workers return their own error lists, which are folded back into
+        this instance so get_calculation_errors keeps working. Any pool
+        failure (e.g. an unpicklable config) falls back to the serial path.
+        """
+        n_workers = min(os.cpu_count() or 1, 8)
+        chunk_size = math.ceil(len(pairs) / n_workers)
+        chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+        results = []
+        # Snapshot so a mid-batch pool failure can discard errors already
+        # folded in from completed chunks; the serial fallback re-runs
+        # every pair and would otherwise append them a second time.
+        errors_before = list(self.calculation_errors)
+        try:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                for chunk_results, chunk_errors in executor.map(
+                    _batch_worker, [(chunk, kwargs) for chunk in chunks]
+                ):
+                    results.extend(chunk_results)
+                    self.calculation_errors.extend(chunk_errors)
+        except Exception:
+            self.calculation_errors = errors_before
+            return self._calculate_batch_serial(pairs, kwargs)
+        return results
+
     def calculate_all_costs(self, materials, suppliers, packaging_configs, transport_configs,
                          warehouse_configs, co2_configs, operations_configs=None,
                          repacking_configs=None, customs_configs=None,
@@ -1172,6 +1318,12 @@ class LogisticsCostCalculator:
         """
         return self.calculation_errors
 
+    def clear_errors(self):
+        """
+        Reset the error list before a new calculation run.
+        """
+        self.calculation_errors = []
+
     def validate_configuration(self, material, supplier, packaging_config, transport_config, warehouse_config, co2_config):
         """
         Validate that all required configuration parameters are present and valid.
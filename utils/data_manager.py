@@ -153,7 +153,17 @@ class DataManager:
             st.session_state.last_save_time = None
         if 'data_loaded' not in st.session_state:
             st.session_state.data_loaded = False
-    
+        if 'data_version' not in st.session_state:
+            st.session_state.data_version = 0
+
+    @property
+    def version(self) -> int:
+        """Monotonic counter bumped on every mutation.
+
+        Cached consumers can key on this instead of hashing the data itself.
+        """
+        return st.session_state.get('data_version', 0)
+
     def _load_data_on_startup(self):
         """Load data from file on application startup"""
         if not st.session_state.data_loaded and self.data_file.exists():
@@ -213,6 +223,10 @@ class DataManager:
     
     def _save_data_automatically(self):
         """Save data to file automatically after changes"""
+        # Every mutator funnels through here, so this is the single place
+        # to advance the data version (even when auto-save is disabled).
+        st.session_state.data_version = st.session_state.get('data_version', 0) + 1
+
         if not st.session_state.get('auto_save', True):
             return
         
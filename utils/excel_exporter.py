@@ -50,8 +50,12 @@ class LogisticsExcelExporter:
         
         # Define borders
         thin_border = Side(border_style="thin", color=self.colors['border_gray'])
-        self.border = Border(top=thin_border, left=thin_border, 
+        self.border = Border(top=thin_border, left=thin_border,
                            right=thin_border, bottom=thin_border)
+
+        # Shared alignment (openpyxl style objects are immutable, so one
+        # instance can be assigned to any number of cells)
+        self.align_center = Alignment(horizontal='center', vertical='center')
     
     def create_logistics_report(self, calculation_result, plant_id="1051", version="1.5.5", created_by="System"):
         """
@@ -126,7 +130,7 @@ class LogisticsExcelExporter:
         title_cell = ws[f'A{row}']
         title_cell.value = "Logistic cost calculation"
         title_cell.font = self.fonts['title']
-        title_cell.alignment = Alignment(horizontal='center', vertical='center')
+        title_cell.alignment = self.align_center
         title_cell.fill = self.fills['header_blue']
         title_cell.border = self.border
         row += 1
@@ -8,7 +8,11 @@ This module handles the packaging data database, providing functionality to:
 3. Support import/export functionality
 """
 
-import json
+import os
+import pickle
+import threading
+from contextlib import contextmanager
+import orjson
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional
@@ -17,6 +21,22 @@ import streamlit as st
 from .packaging_tables import STANDARD_BOXES, SPECIAL_PACKAGING, ADDITIONAL_PACKAGING, ACCESSORY_PACKAGING
 
 
+# Numeric field typing per category attribute, enforced when items are
+# written or loaded so the edit widgets can trust the stored types.
+_INT_FIELDS = {
+    'standard_boxes': ('L', 'W', 'H', 'Pcs_Boxes_per_LU', 'Boxes_per_layer'),
+    'special_packaging': (),
+    'additional_packaging': ('L', 'W', 'H', 'Pcs_Boxes_per_LU', 'Boxes_per_layer'),
+    'accessory_packaging': ('No_per_PU',),
+}
+_FLOAT_FIELDS = {
+    'standard_boxes': ('Cost_per_pcs', 'MT_weight_kg'),
+    'special_packaging': ('Cost_per_pcs', 'MT_weight_kg'),
+    'additional_packaging': ('Cost_per_pcs', 'MT_weight_kg'),
+    'accessory_packaging': ('Ave_Price', 'Ave_Weight_kg'),
+}
+
+
 class PackagingDatabase:
     """
     Manages the packaging database and provides CRUD functionality.
@@ -27,25 +47,46 @@ class PackagingDatabase:
         self.special_packaging = {}
         self.additional_packaging = {}
         self.accessory_packaging = {}
+        # Monotonic counter bumped on every mutation; cheap cache key for
+        # anything derived from the category dicts.
+        self._version = 0
+        # Set by mutators, cleared by saves; lets callers coalesce many
+        # edits into one write per rerun.
+        self._dirty = False
+        # Serializes saves when the instance is shared across sessions
+        # (st.cache_resource).
+        self._lock = threading.Lock()
+        # While True, internal saves are deferred to the enclosing
+        # transaction() block.
+        self._in_transaction = False
         self._load_default_data()
+        self._dirty = False
 
     def _load_default_data(self):
         """Load default data from packaging_tables.py"""
-        self.standard_boxes = STANDARD_BOXES.copy()
-        self.special_packaging = SPECIAL_PACKAGING.copy()
-        self.additional_packaging = ADDITIONAL_PACKAGING.copy()
-        self.accessory_packaging = ACCESSORY_PACKAGING.copy()
+        # Copy per-item dicts, not just the outer mapping: a shallow
+        # .copy() left the item dicts aliased to the module defaults.
+        self.standard_boxes = {name: dict(item) for name, item in STANDARD_BOXES.items()}
+        self.special_packaging = {name: dict(item) for name, item in SPECIAL_PACKAGING.items()}
+        self.additional_packaging = {name: dict(item) for name, item in ADDITIONAL_PACKAGING.items()}
+        self.accessory_packaging = {name: dict(item) for name, item in ACCESSORY_PACKAGING.items()}
+        self._version += 1
+        self._dirty = True
 
     def load_from_json(self, file_path: str):
         """Load packaging data from JSON file."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(file_path, 'rb') as f:
+                data = orjson.loads(f.read())
             
             self.standard_boxes = data.get('standard_boxes', {})
             self.special_packaging = data.get('special_packaging', {})
             self.additional_packaging = data.get('additional_packaging', {})
             self.accessory_packaging = data.get('accessory_packaging', {})
+            self.coerce_types()
+            self._version += 1
+            # Just loaded: in sync with disk.
+            self._dirty = False
             
         except FileNotFoundError:
             # If file doesn't exist, use default data
@@ -54,6 +95,65 @@ class PackagingDatabase:
             st.error(f"Error loading packaging database: {e}")
             self._load_default_data()
 
+    def load_from_pickle(self, file_path: str):
+        """Load packaging data from the binary internal store.
+
+        Falls back to the JSON loader when no pickle exists yet, so the
+        first run after the format switch picks up the old file.
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                data = pickle.load(f)
+            self.standard_boxes = data.get('standard_boxes', {})
+            self.special_packaging = data.get('special_packaging', {})
+            self.additional_packaging = data.get('additional_packaging', {})
+            self.accessory_packaging = data.get('accessory_packaging', {})
+            self.coerce_types()
+            self._version += 1
+            self._dirty = False
+        except FileNotFoundError:
+            self.load_from_json('packaging_database.json')
+        except Exception as e:
+            st.error(f"Error loading packaging database: {e}")
+            self._load_default_data()
+
+    @contextmanager
+    def transaction(self, file_path: str = 'packaging_database.pkl'):
+        """Group several mutations into a single save.
+
+        Internal saves issued inside the block are suppressed; the store
+        is written once on exit, and only if something actually changed.
+        """
+        self._in_transaction = True
+        try:
+            yield self
+        finally:
+            self._in_transaction = False
+            if self._dirty:
+                self.save_to_pickle(file_path)
+
+    def save_to_pickle(self, file_path: str):
+        """Save packaging data to the binary internal store.
+
+        pickle protocol 5 round-trips the nested dicts without the
+        encode/parse cost of JSON; save_to_json remains the user-facing
+        export format.
+        """
+        if self._in_transaction:
+            return
+        data = {
+            'standard_boxes': self.standard_boxes,
+            'special_packaging': self.special_packaging,
+            'additional_packaging': self.additional_packaging,
+            'accessory_packaging': self.accessory_packaging,
+        }
+        tmp_path = f"{file_path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(data, f, protocol=5)
+            os.replace(tmp_path, file_path)
+            self._dirty = False
+
     def save_to_json(self, file_path: str):
         """Save packaging data to JSON file."""
         data = {
@@ -67,44 +167,84 @@ class PackagingDatabase:
             }
         }
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Write to a sibling temp file and move it into place so readers
+        # never observe a half-written database. orjson serializes in C
+        # and emits UTF-8 bytes directly.
+        tmp_path = f"{file_path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_path, file_path)
+            self._dirty = False
+
+    @staticmethod
+    def _coerce_item(category: str, data: Dict) -> Dict:
+        """Normalize numeric fields to the types the edit widgets expect."""
+        for field in _INT_FIELDS[category]:
+            if field in data:
+                data[field] = int(data[field] or 0)
+        for field in _FLOAT_FIELDS[category]:
+            if field in data:
+                data[field] = float(data[field] or 0.0)
+        return data
+
+    def coerce_types(self):
+        """Apply field typing to every stored item, e.g. after a bulk load."""
+        for category in _INT_FIELDS:
+            for data in getattr(self, category).values():
+                self._coerce_item(category, data)
 
     def add_standard_box(self, box_name: str, box_data: Dict):
         """Add or update standard box configuration."""
-        self.standard_boxes[box_name] = box_data
+        self.standard_boxes[box_name] = self._coerce_item('standard_boxes', box_data)
+        self._version += 1
+        self._dirty = True
 
     def remove_standard_box(self, box_name: str):
         """Remove standard box configuration."""
         if box_name in self.standard_boxes:
             del self.standard_boxes[box_name]
+        self._version += 1
+        self._dirty = True
 
     def add_special_packaging(self, package_name: str, package_data: Dict):
         """Add or update special packaging configuration."""
-        self.special_packaging[package_name] = package_data
+        self.special_packaging[package_name] = self._coerce_item('special_packaging', package_data)
+        self._version += 1
+        self._dirty = True
 
     def remove_special_packaging(self, package_name: str):
         """Remove special packaging configuration."""
         if package_name in self.special_packaging:
             del self.special_packaging[package_name]
+        self._version += 1
+        self._dirty = True
 
     def add_additional_packaging(self, package_name: str, package_data: Dict):
         """Add or update additional packaging configuration."""
-        self.additional_packaging[package_name] = package_data
+        self.additional_packaging[package_name] = self._coerce_item('additional_packaging', package_data)
+        self._version += 1
+        self._dirty = True
 
     def remove_additional_packaging(self, package_name: str):
         """Remove additional packaging configuration."""
         if package_name in self.additional_packaging:
             del self.additional_packaging[package_name]
+        self._version += 1
+        self._dirty = True
 
     def add_accessory_packaging(self, accessory_name: str, accessory_data: Dict):
         """Add or update accessory packaging configuration."""
-        self.accessory_packaging[accessory_name] = accessory_data
+        self.accessory_packaging[accessory_name] = self._coerce_item('accessory_packaging', accessory_data)
+        self._version += 1
+        self._dirty = True
 
     def remove_accessory_packaging(self, accessory_name: str):
         """Remove accessory packaging configuration."""
         if accessory_name in self.accessory_packaging:
             del self.accessory_packaging[accessory_name]
+        self._version += 1
+        self._dirty = True
 
     def get_all_packaging_types(self):
         """Get all packaging types for dropdowns."""
@@ -129,45 +269,72 @@ class PackagingDatabase:
         return {}
 
     def get_statistics(self):
-        """Get statistics about the packaging database."""
-        return {
-            'standard_boxes_count': len(self.standard_boxes),
-            'special_packaging_count': len(self.special_packaging),
-            'additional_packaging_count': len(self.additional_packaging),
-            'accessory_packaging_count': len(self.accessory_packaging),
-            'total_items': len(self.standard_boxes) + len(self.special_packaging) + 
-                          len(self.additional_packaging) + len(self.accessory_packaging)
-        }
+        """Get statistics about the packaging database.
+
+        dict len() is already O(1), so the counts cost nothing to read;
+        the dict itself is rebuilt only when the database version changes.
+        """
+        if getattr(self, '_stats_version', None) != self._version:
+            counts = (len(self.standard_boxes), len(self.special_packaging),
+                      len(self.additional_packaging), len(self.accessory_packaging))
+            self._stats = {
+                'standard_boxes_count': counts[0],
+                'special_packaging_count': counts[1],
+                'additional_packaging_count': counts[2],
+                'accessory_packaging_count': counts[3],
+                'total_items': sum(counts),
+            }
+            self._stats_version = self._version
+        return self._stats
 
     def reset_to_defaults(self):
         """Reset database to default values."""
         self._load_default_data()
 
+    def _name_index(self):
+        """Lowercased name index per category, rebuilt only after mutations.
+
+        Searching lowercased every key on every call; the index does that
+        once per database version so repeated searches are substring scans
+        over prebuilt strings.
+        """
+        if getattr(self, '_index_version', None) != self._version:
+            self._index = {
+                'Standard Boxes': [(name.lower(), name) for name in self.standard_boxes],
+                'Special Packaging': [(name.lower(), name) for name in self.special_packaging],
+                'Additional Packaging': [(name.lower(), name) for name in self.additional_packaging],
+                'Accessory Packaging': [(name.lower(), name) for name in self.accessory_packaging],
+            }
+            self._index_version = self._version
+        return self._index
+
+    def item_names(self, category: str):
+        """Sorted name tuple for one category, rebuilt on version change.
+
+        Backs the Edit/Delete selectboxes so each rerun reuses the same
+        tuple instead of listing and sorting the keys again.
+        """
+        if getattr(self, '_names_version', None) != self._version:
+            self._names = {
+                'Standard Boxes': tuple(sorted(self.standard_boxes)),
+                'Special Packaging': tuple(sorted(self.special_packaging)),
+                'Additional Packaging': tuple(sorted(self.additional_packaging)),
+                'Accessory Packaging': tuple(sorted(self.accessory_packaging)),
+            }
+            self._names_version = self._version
+        return self._names[category]
+
     def search_packaging(self, search_term: str):
         """Search for packaging items by name."""
-        results = {
-            'Standard Boxes': {},
-            'Special Packaging': {},
-            'Additional Packaging': {},
-            'Accessory Packaging': {}
-        }
-        
         search_term = search_term.lower()
-        
-        for name, data in self.standard_boxes.items():
-            if search_term in name.lower():
-                results['Standard Boxes'][name] = data
-                
-        for name, data in self.special_packaging.items():
-            if search_term in name.lower():
-                results['Special Packaging'][name] = data
-                
-        for name, data in self.additional_packaging.items():
-            if search_term in name.lower():
-                results['Additional Packaging'][name] = data
-                
-        for name, data in self.accessory_packaging.items():
-            if search_term in name.lower():
-                results['Accessory Packaging'][name] = data
-        
-        return results
\ No newline at end of file
+        categories = {
+            'Standard Boxes': self.standard_boxes,
+            'Special Packaging': self.special_packaging,
+            'Additional Packaging': self.additional_packaging,
+            'Accessory Packaging': self.accessory_packaging,
+        }
+        index = self._name_index()
+        return {
+            category: {name: items[name] for lowered, name in index[category] if search_term in lowered}
+            for category, items in categories.items()
+        }
\ No newline at end of file
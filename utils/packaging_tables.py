@@ -1,5 +1,7 @@
 # packaging_tables.py
 
+from types import MappingProxyType
+
 STANDARD_BOXES = {  
     "None": {
         "Packaging_Characteristics": "",
@@ -359,3 +361,10 @@ ACCESSORY_PACKAGING = {
         "Packaging_Characteristics": "Returnable",
     },
 }
+
+# Read-only views so no consumer can mutate the shipped defaults in
+# place; copies for editing belong to PackagingDatabase.
+STANDARD_BOXES = MappingProxyType(STANDARD_BOXES)
+SPECIAL_PACKAGING = MappingProxyType(SPECIAL_PACKAGING)
+ADDITIONAL_PACKAGING = MappingProxyType(ADDITIONAL_PACKAGING)
+ACCESSORY_PACKAGING = MappingProxyType(ACCESSORY_PACKAGING)
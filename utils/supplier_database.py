@@ -17,13 +17,102 @@ from pathlib import Path
 import streamlit as st
 
 
+# Canonical supplier schema: defaults applied whenever a record is written to
+# the database, so read paths can rely on every key being present and typed.
+SUPPLIER_DEFAULTS: Dict = {
+    'vendor_id': '',
+    'vendor_zip': '',
+    'vendor_name': '',
+    'vendor_country': '',
+    'city_of_manufacture': '',
+    'delivery_performance': 0.0,
+    'deliveries_per_month': 0,
+    'plant': '',        # KB/Bendix plant
+    'country': '',      # KB/Bendix country
+    'distance': 0.0,
+}
+
+_NUMERIC_FIELDS = (
+    ('delivery_performance', float),
+    ('deliveries_per_month', int),
+    ('distance', float),
+)
+
+
+# CSV/display header -> raw record key, for bulk ingest.
+_CSV_COLUMN_MAP = {
+    'Vendor ID': 'vendor_id',
+    'Vendor ZIP': 'vendor_zip',
+    'Vendor Name': 'vendor_name',
+    'Vendor Country': 'vendor_country',
+    'City of Manufacture': 'city_of_manufacture',
+    'Delivery Performance (%)': 'delivery_performance',
+    'Deliveries per Month': 'deliveries_per_month',
+    'KB/Bendix Plant': 'plant',
+    'Distance (km)': 'distance',
+    'KB/Bendix Country': 'country',
+}
+
+
+def normalize_supplier_record(record: Optional[Dict]) -> Dict:
+    """Apply schema defaults and numeric coercion to a raw supplier record."""
+    s = dict(record or {})
+
+    for key, default in SUPPLIER_DEFAULTS.items():
+        if key not in s or s[key] is None:
+            s[key] = default
+
+    for field, caster in _NUMERIC_FIELDS:
+        try:
+            s[field] = caster(s.get(field) or 0)
+        except Exception:
+            s[field] = SUPPLIER_DEFAULTS[field]
+
+    return s
+
+
+def normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """Vectorized counterpart of normalize_supplier_record for bulk ingest.
+
+    Applies schema defaults and numeric coercion column-wise with
+    pd.to_numeric instead of a per-record try/except loop.
+    """
+    df = df.copy()
+    for key, default in SUPPLIER_DEFAULTS.items():
+        if key not in df.columns:
+            df[key] = default
+
+    numeric = set()
+    for field, caster in _NUMERIC_FIELDS:
+        numeric.add(field)
+        df[field] = pd.to_numeric(df[field], errors='coerce').fillna(SUPPLIER_DEFAULTS[field])
+        if caster is int:
+            df[field] = df[field].astype(int)
+
+    for key in SUPPLIER_DEFAULTS:
+        if key not in numeric:
+            df[key] = df[key].fillna('').astype(str)
+
+    return df[list(SUPPLIER_DEFAULTS)]
+
+
 class SupplierDatabase:
     """
     Manages the supplier historical database and provides CRUD functionality.
+
+    Records are normalized once on write; the display DataFrame is built
+    columnar and cached until the database mutates.
     """
 
     def __init__(self):
         self.database = {}  # Dict with vendor_id as key
+        self._df_cache: Optional[pd.DataFrame] = None
+        self._dirty = False  # True when in-memory state differs from disk
+
+    def _invalidate(self):
+        """Drop derived caches and mark the database dirty after a mutation."""
+        self._df_cache = None
+        self._dirty = True
 
     def load_from_json(self, file_path: str):
         """Load supplier data from JSON file."""
@@ -31,8 +120,13 @@ class SupplierDatabase:
             with open(file_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
-            self.database = data.get('database', {})
-            
+            self.database = {
+                vid: normalize_supplier_record(rec)
+                for vid, rec in data.get('database', {}).items()
+            }
+            self._invalidate()
+            self._dirty = False  # just loaded, in sync with disk
+
         except FileNotFoundError:
             self.database = {}
         except Exception as e:
@@ -53,6 +147,40 @@ class SupplierDatabase:
         with open(file_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
 
+    def save_to_parquet(self, file_path: str):
+        """Save supplier data to a Parquet file (columnar, Snappy-compressed).
+
+        Used for the internal working copy; JSON stays available as the
+        interop export format.
+        """
+        if self.database:
+            df = pd.DataFrame.from_dict(self.database, orient='index')
+        else:
+            df = pd.DataFrame(columns=list(SUPPLIER_DEFAULTS))
+
+        df.to_parquet(file_path, engine='pyarrow', compression='snappy', index=False)
+        self._dirty = False
+
+    def load_from_parquet(self, file_path: str):
+        """Load supplier data from a Parquet file."""
+        try:
+            df = pd.read_parquet(file_path, engine='pyarrow')
+        except FileNotFoundError:
+            self.database = {}
+            return
+        except Exception as e:
+            st.error(f"Error loading supplier database: {e}")
+            self.database = {}
+            return
+
+        self.database = {
+            rec['vendor_id']: normalize_supplier_record(rec)
+            for rec in df.to_dict('records')
+            if rec.get('vendor_id')
+        }
+        self._invalidate()
+        self._dirty = False  # just loaded, in sync with disk
+
     def sync_with_configurations(self, supplier_configs: List[Dict]):
         """
         Sync database with current supplier configurations.
@@ -62,32 +190,28 @@ class SupplierDatabase:
             vendor_id = supplier.get('vendor_id')
             if vendor_id:
                 # Update or add supplier to database with CORRECT key names
-                self.database[vendor_id] = {
-                    'vendor_id': supplier.get('vendor_id', ''),
-                    'vendor_name': supplier.get('vendor_name', ''),
-                    'vendor_country': supplier.get('vendor_country', ''),
-                    'city_of_manufacture': supplier.get('city_of_manufacture', ''),
-                    'vendor_zip': supplier.get('vendor_zip', ''),
-                    'delivery_performance': supplier.get('delivery_performance', 0.0),
-                    'deliveries_per_month': supplier.get('deliveries_per_month', 0),
-                    'plant': supplier.get('plant', ''),      # FIXED: was 'kb_plant'
-                    'country': supplier.get('country', ''),  # FIXED: was 'kb_country'
-                    'distance': supplier.get('distance', 0.0)
-                }
+                self.database[vendor_id] = normalize_supplier_record({
+                    key: supplier.get(key, default)
+                    for key, default in SUPPLIER_DEFAULTS.items()
+                })
+        self._invalidate()
 
     def add_supplier(self, vendor_id: str, supplier_data: Dict):
         """Add or update supplier in database."""
-        self.database[vendor_id] = supplier_data
+        self.database[vendor_id] = normalize_supplier_record(supplier_data)
+        self._invalidate()
 
     def remove_supplier(self, vendor_id: str):
         """Remove supplier from database."""
         if vendor_id in self.database:
             del self.database[vendor_id]
+            self._invalidate()
 
     def update_supplier(self, vendor_id: str, supplier_data: Dict):
         """Update existing supplier."""
         if vendor_id in self.database:
-            self.database[vendor_id] = supplier_data
+            self.database[vendor_id] = normalize_supplier_record(supplier_data)
+            self._invalidate()
 
     def supplier_exists(self, vendor_id: str) -> bool:
         """Check if supplier exists in database."""
@@ -102,63 +226,69 @@ class SupplierDatabase:
         return list(self.database.values())
 
     def to_dataframe(self) -> pd.DataFrame:
-        """Convert database to pandas DataFrame with proper column order."""
+        """Convert database to pandas DataFrame with proper column order.
+
+        The frame is built column-wise from the normalized records and cached
+        until the database mutates; callers get a copy they may modify.
+        Because the instance lives in st.session_state, the cache also
+        persists across Streamlit reruns, so repeat export clicks on an
+        unchanged database never rebuild the frame.
+        """
         if not self.database:
             return pd.DataFrame()
-        
-        data_list = []
-        for idx, (vendor_id, supplier_data) in enumerate(self.database.items(), 1):
-            row = {
-                'Index': idx,
-                'Vendor ID': supplier_data.get('vendor_id', ''),
-                'Vendor ZIP': supplier_data.get('vendor_zip', ''),
-                'Vendor Name': supplier_data.get('vendor_name', ''),
-                'Vendor Country': supplier_data.get('vendor_country', ''),
-                'City of Manufacture': supplier_data.get('city_of_manufacture', ''),
-                'Delivery Performance (%)': supplier_data.get('delivery_performance', 0.0),
-                'Deliveries per Month': supplier_data.get('deliveries_per_month', 0),
-                'KB/Bendix Plant': supplier_data.get('plant', ''),      # FIXED: use 'plant'
-                'Distance (km)': supplier_data.get('distance', 0.0),
-                'KB/Bendix Country': supplier_data.get('country', '')  # FIXED: use 'country'
-            }
-            data_list.append(row)
-        
-        return pd.DataFrame(data_list)
+
+        if self._df_cache is None:
+            records = list(self.database.values())
+            self._df_cache = pd.DataFrame({
+                'Index': range(1, len(records) + 1),
+                'Vendor ID': [r.get('vendor_id', '') for r in records],
+                'Vendor ZIP': [r.get('vendor_zip', '') for r in records],
+                'Vendor Name': [r.get('vendor_name', '') for r in records],
+                'Vendor Country': [r.get('vendor_country', '') for r in records],
+                'City of Manufacture': [r.get('city_of_manufacture', '') for r in records],
+                'Delivery Performance (%)': [r.get('delivery_performance', 0.0) for r in records],
+                'Deliveries per Month': [r.get('deliveries_per_month', 0) for r in records],
+                'KB/Bendix Plant': [r.get('plant', '') for r in records],
+                'Distance (km)': [r.get('distance', 0.0) for r in records],
+                'KB/Bendix Country': [r.get('country', '') for r in records],
+            })
+
+        return self._df_cache.copy()
 
     def load_from_csv_dataframe(self, df: pd.DataFrame):
-        """Load suppliers from CSV DataFrame."""
-        self.database = {}
-        
-        for _, row in df.iterrows():
-            vendor_id = str(row.get('Vendor ID', ''))
-            if vendor_id:
-                self.database[vendor_id] = {
-                    'vendor_id': vendor_id,
-                    'vendor_zip': str(row.get('Vendor ZIP', '')),
-                    'vendor_name': str(row.get('Vendor Name', '')),
-                    'vendor_country': str(row.get('Vendor Country', '')),
-                    'city_of_manufacture': str(row.get('City of Manufacture', '')),
-                    'delivery_performance': float(row.get('Delivery Performance (%)', 0.0)),
-                    'deliveries_per_month': int(row.get('Deliveries per Month', 0)),
-                    'plant': str(row.get('KB/Bendix Plant', '')),      # FIXED: use 'plant'
-                    'distance': float(row.get('Distance (km)', 0.0)),
-                    'country': str(row.get('KB/Bendix Country', ''))  # FIXED: use 'country'
-                }
+        """Load suppliers from a CSV DataFrame with display column headers.
+
+        The whole frame is sanitized column-wise via normalize_dataframe
+        rather than row by row.
+        """
+        clean = normalize_dataframe(df.rename(columns=_CSV_COLUMN_MAP))
+        self.database = {
+            rec['vendor_id']: rec
+            for rec in clean.to_dict('records')
+            if rec['vendor_id']
+        }
+        self._invalidate()
 
     def filter_suppliers(self, vendor_id: str = None, country: str = None, city: str = None) -> List[Dict]:
-        """Filter suppliers based on criteria."""
-        filtered = []
-        
-        for supplier_data in self.database.values():
-            if vendor_id and vendor_id.lower() not in supplier_data.get('vendor_id', '').lower():
-                continue
-            if country and country.lower() not in supplier_data.get('vendor_country', '').lower():
-                continue
-            if city and city.lower() not in supplier_data.get('city_of_manufacture', '').lower():
-                continue
-            filtered.append(supplier_data)
-        
-        return filtered
+        """Filter suppliers based on criteria.
+
+        The substring matches run as vectorized string scans over the
+        cached DataFrame instead of per-record Python comparisons; the
+        original records are returned for the surviving rows.
+        """
+        if not self.database:
+            return []
+
+        df = self.to_dataframe()
+        mask = pd.Series(True, index=df.index)
+        if vendor_id:
+            mask &= df['Vendor ID'].astype(str).str.contains(vendor_id, case=False, na=False, regex=False)
+        if country:
+            mask &= df['Vendor Country'].astype(str).str.contains(country, case=False, na=False, regex=False)
+        if city:
+            mask &= df['City of Manufacture'].astype(str).str.contains(city, case=False, na=False, regex=False)
+
+        return [rec for rec, keep in zip(self.database.values(), mask.to_numpy()) if keep]
 
     def get_statistics(self) -> Dict:
         """Get statistics about the supplier database."""